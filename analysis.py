@@ -0,0 +1,120 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic import GameLogic
+
+# positions per task: big enough to amortize the pool, small enough to keep output flowing
+CHUNK_POSITIONS = 64
+
+# one engine per board shape and process, so its position cache carries over between positions
+_ENGINES = {}
+
+
+def analyze_chunk(size, k, positions, deadline_ms=None, time_limit=1.0):
+    game = _ENGINES.get((size, k))
+    if game is None:
+        game = _ENGINES[(size, k)] = GameLogic(size, k)
+    game.time_limit = time_limit
+
+    results = []
+    for board, played in positions:
+        analysis = game.analyze(board, deadline_ms)
+        results.append({
+            'board': board,
+            'played': played,
+            'depth': game.last_search_depth,
+            'moves': [entry._asdict() for entry in analysis],
+        })
+    return results
+
+
+def log_positions(path):
+    # every position of every logged game, with the move that was played from it
+    from game_log import GameLogReader
+
+    with GameLogReader(path) as reader:
+        for record in reader:
+            board = ['.'] * (record.size * record.size)
+            for index, move in enumerate(record.moves):
+                yield record.size, record.k, ''.join(board), move
+                board[move] = 'X' if index % 2 == 0 else 'O'
+
+
+def text_positions(lines, size, k):
+    # one board per line, '.' for empty cells, optionally followed by the move played
+    for line in lines:
+        fields = line.split()
+        if fields and not fields[0].startswith('#'):
+            yield size, k, fields[0], int(fields[1]) if len(fields) > 1 else None
+
+
+def chunks(positions, chunk_size=CHUNK_POSITIONS):
+    # consecutive positions of one shape stay together, so a game's positions share a worker's cache
+    for (size, k), group in itertools.groupby(positions, key=lambda position: position[:2]):
+        group = iter(group)
+        while True:
+            chunk = [(board, played) for _, _, board, played in itertools.islice(group, chunk_size)]
+            if not chunk:
+                break
+            yield size, k, chunk
+
+
+def analyze_positions(positions, workers=None, deadline_ms=None, time_limit=1.0, chunk_size=CHUNK_POSITIONS):
+    # yields results in input order as soon as they are ready, with a bounded number of tasks in flight
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for size, k, chunk in chunks(positions, chunk_size):
+            pending.append(pool.submit(analyze_chunk, size, k, chunk, deadline_ms, time_limit))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score every move of many positions, streaming JSON lines")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--log', help="analyze every position of the games in a game log")
+    source.add_argument('--boards', help="file with one board per line ('-' for stdin), e.g. X...O....")
+    parser.add_argument('--size', type=int, default=3, help="board size for --boards")
+    parser.add_argument('--k', type=int, default=None, help="marks in a row for --boards (default: SIZE)")
+    parser.add_argument('--deadline-ms', type=float, default=None, help="hard cap per position")
+    parser.add_argument('--time-limit', type=float, default=1.0, help="stop deepening after this many seconds")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', '-o', default='-', help="JSON lines output ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    if args.log:
+        positions = log_positions(args.log)
+        boards_file = None
+    else:
+        boards_file = sys.stdin if args.boards == '-' else open(args.boards)
+        positions = text_positions(boards_file, args.size, args.k or args.size)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    started = time.perf_counter()
+    count = 0
+    try:
+        for result in analyze_positions(positions, args.workers, args.deadline_ms, args.time_limit):
+            out.write(json.dumps(result) + '\n')
+            count += 1
+            if count % 1000 == 0:
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if boards_file is not None and boards_file is not sys.stdin:
+            boards_file.close()
+    print(f"analyzed {count} positions in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
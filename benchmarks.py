@@ -0,0 +1,249 @@
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from compact_game import CompactGame
+from game_logic import GameLogic
+
+# (size, k, human moves, ai moves); the AI is always to move in these positions
+POSITIONS = {
+    'empty': (3, 3, [], []),
+    'opening': (3, 3, [4], []),
+    'midgame': (3, 3, [0, 4], [8]),
+    'late': (3, 3, [0, 4, 5], [8, 3]),
+    'midgame_4x4': (4, 4, [5, 10], [0]),
+}
+
+
+class CountingGameLogic(GameLogic):
+    nodes = 0
+
+    def _minimax(self, *args):
+        self.nodes += 1
+        return super()._minimax(*args)
+
+
+def make_game(position, game_class=GameLogic):
+    size, k, human_moves, ai_moves = POSITIONS[position]
+    game = game_class(size, k, rng=random.Random(0))
+    for move in human_moves:
+        game.make_move(move, game.human)
+    for move in ai_moves:
+        game.make_move(move, game.ai)
+    return game
+
+
+def minimax_case(position, is_maximizing):
+    def build(game_class):
+        game = make_game(position, game_class)
+        ai_bits = game.bitboards[game.ai]
+        human_bits = game.bitboards[game.human]
+
+        def setup():
+            game.position_cache.clear()
+            game._reset_move_ordering()
+            game._depth_limit = game.cells + 1
+
+        def run():
+            game._minimax(ai_bits, human_bits, 0, is_maximizing, -math.inf, math.inf)
+
+        return game, setup, run
+    return build
+
+
+def ai_move_case(position, difficulty, max_depth=None):
+    def build(game_class):
+        game = make_game(position, game_class)
+        game.set_difficulty(difficulty)
+        game.max_depth = max_depth
+        game.time_limit = None
+
+        def setup():
+            game.position_cache.clear()
+            # weakened levels search with a cache of their own that outlives the game, and every
+            # run should draw the same blunders
+            game._strength_cache = None
+            game.seed_game(0)
+
+        return game, setup, game.get_ai_move
+    return build
+
+
+def method_case(position, method):
+    def build(game_class):
+        game = make_game(position, game_class)
+        return game, None, getattr(game, method)
+    return build
+
+
+def check_game_end_case(position):
+    def build(game_class):
+        game = make_game(position, game_class)
+
+        def setup():
+            game.game_over = False
+
+        return game, setup, game.check_game_end
+    return build
+
+
+CASES = {
+    'evaluate_board': method_case('midgame', 'evaluate_board'),
+    'get_available_moves': method_case('midgame', 'get_available_moves'),
+    'check_game_end': check_game_end_case('midgame'),
+    'minimax_empty': minimax_case('empty', False),
+    'minimax_midgame': minimax_case('midgame', True),
+    'minimax_late': minimax_case('late', True),
+    'ai_move_easy': ai_move_case('opening', 'Easy'),
+    'ai_move_medium': ai_move_case('opening', 'Medium'),
+    'ai_move_hard': ai_move_case('opening', 'Hard'),
+    'ai_move_hard_4x4_depth4': ai_move_case('midgame_4x4', 'Hard', max_depth=4),
+}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_case(name, build, min_time, min_repeat):
+    game, setup, run = build(GameLogic)
+    if setup:
+        setup()
+    run()  # warm-up: fills lazy tables such as the solved 3x3 positions
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < min_repeat or time.perf_counter() - started < min_time:
+        if setup:
+            setup()
+        begin = time.perf_counter_ns()
+        run()
+        samples.append(time.perf_counter_ns() - begin)
+
+    game, setup, run = build(CountingGameLogic)
+    if setup:
+        setup()
+    tracemalloc.start()
+    run()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    mean_ns = sum(samples) / len(samples)
+    result = {
+        'repeats': len(samples),
+        'ops_per_sec': 1e9 / mean_ns,
+        'p50_us': percentile(samples, 0.50) / 1000,
+        'p99_us': percentile(samples, 0.99) / 1000,
+        'peak_memory_bytes': peak_bytes,
+    }
+    if game.nodes:
+        result['nodes'] = game.nodes
+        result['nodes_per_sec'] = game.nodes * 1e9 / mean_ns
+    return result
+
+
+def measure_game_memory(count):
+    # bytes per live game mid-way through play, shared tables warmed up first
+    factories = {
+        'GameLogic': (GameLogic, lambda game, cell, is_ai: game.make_move(cell, game.ai if is_ai else game.human)),
+        'CompactGame': (CompactGame, lambda game, cell, is_ai: game.make_move(cell, is_ai)),
+    }
+    results = {}
+    for name, (factory, move) in factories.items():
+        factory()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        games = []
+        for _ in range(count):
+            game = factory()
+            for index, cell in enumerate((4, 0, 8)):
+                move(game, cell, index % 2 == 1)
+            games.append(game)
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        # the list holding the games is not part of a game
+        results[name] = (used - sys.getsizeof(games)) / count
+        del games
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'commit': commit}
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = result['ops_per_sec'] / before['ops_per_sec'] - 1
+        marker = ''
+        if change < -threshold:
+            regressions.append(name)
+            marker = '  REGRESSION'
+        print(f"{name:<26} {before['ops_per_sec']:>14.1f} -> {result['ops_per_sec']:>14.1f} ops/s "
+              f"({change:+.1%}){marker}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search and evaluation hot paths")
+    parser.add_argument('cases', nargs='*', metavar='CASE',
+                        help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--min-time', type=float, default=1.0, help="seconds to spend per case")
+    parser.add_argument('--min-repeat', type=int, default=20)
+    parser.add_argument('--memory', type=int, metavar='GAMES', default=0,
+                        help="also report bytes per live game, measured over this many games")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="fractional ops/s drop counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+    for name in args.cases:
+        if name not in CASES:
+            parser.error(f"unknown case {name!r}")
+
+    results = {}
+    print(f"{'case':<26} {'ops/s':>14} {'p50 us':>10} {'p99 us':>10} {'nodes/s':>12} {'peak KiB':>9}")
+    for name in args.cases or CASES:
+        result = run_case(name, CASES[name], args.min_time, args.min_repeat)
+        results[name] = result
+        nodes_per_sec = f"{result['nodes_per_sec']:.0f}" if 'nodes_per_sec' in result else '-'
+        print(f"{name:<26} {result['ops_per_sec']:>14.1f} {result['p50_us']:>10.1f} "
+              f"{result['p99_us']:>10.1f} {nodes_per_sec:>12} {result['peak_memory_bytes'] / 1024:>9.1f}")
+
+    memory = {}
+    if args.memory:
+        memory = measure_game_memory(args.memory)
+        print()
+        for name, size in memory.items():
+            print(f"{name:<26} {size:>10.0f} bytes per live game")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results, 'bytes_per_game': memory}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print()
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
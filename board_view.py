@@ -0,0 +1,168 @@
+import tkinter as tk
+from tkinter import font as tkfont
+
+# boards this big are drawn on one Canvas instead of a Button per cell
+CANVAS_MIN_SIZE = 4
+BOARD_PIXELS = 330
+CELL_GAP = 6
+
+EMPTY, HUMAN, AI, WINNING = 'empty', 'human', 'ai', 'winning'
+
+
+def cell_states(board, human, winning_cells=None):
+    # (kind, text) for every cell: everything a cell shows besides hover
+    winning = set(winning_cells or ())
+    states = []
+    for cell, mark in enumerate(board):
+        if mark == ' ':
+            states.append((EMPTY, ' '))
+        elif cell in winning:
+            states.append((WINNING, mark))
+        else:
+            states.append((HUMAN if mark == human else AI, mark))
+    return states
+
+
+class BoardView:
+    # keeps what every cell currently shows and only redraws cells whose state changed
+    def __init__(self, colors, size, callback):
+        self.colors = colors
+        self.size = size
+        self.callback = callback
+        # the widgets start out as empty cells
+        self.states = [(EMPTY, ' ')] * (size * size)
+        self.hovered = None
+        self.fills = {
+            EMPTY: colors['bg_tertiary'],
+            HUMAN: colors['accent_red'],
+            AI: colors['accent_blue'],
+            WINNING: colors['win_highlight'],
+        }
+        self.text_colors = {
+            EMPTY: colors['text_primary'],
+            HUMAN: 'white',
+            AI: 'white',
+            WINNING: '#000000',
+        }
+
+    def render(self, board, human, winning_cells=None):
+        redrawn = 0
+        for cell, state in enumerate(cell_states(board, human, winning_cells)):
+            if state != self.states[cell]:
+                self.states[cell] = state
+                self.draw_cell(cell, state)
+                redrawn += 1
+        return redrawn
+
+    def hover(self, cell):
+        if cell == self.hovered:
+            return
+        previous, self.hovered = self.hovered, cell
+        for changed in (previous, cell):
+            if changed is not None and self.states[changed][0] == EMPTY:
+                self.draw_cell(changed, self.states[changed])
+
+    def fill(self, cell, kind):
+        if kind == EMPTY and cell == self.hovered:
+            return self.colors['hover_bg']
+        return self.fills[kind]
+
+    def draw_cell(self, cell, state):
+        raise NotImplementedError
+
+
+class ButtonBoardView(BoardView):
+    def __init__(self, parent, colors, size, callback):
+        super().__init__(colors, size, callback)
+        # one Font object per look, shared by every cell instead of a tuple per config call
+        self.empty_font = tkfont.Font(family='Segoe UI', size=max(12, 28 * 3 // size), weight='bold')
+        self.mark_font = tkfont.Font(family='Segoe UI', size=max(12, 32 * 3 // size), weight='bold')
+
+        self.buttons = []
+        for cell in range(size * size):
+            row, col = divmod(cell, size)
+            button = tk.Button(
+                parent,
+                text=' ',
+                font=self.empty_font,
+                width=3,
+                height=1,
+                bg=colors['bg_tertiary'],
+                fg=colors['text_primary'],
+                activebackground=colors['hover_bg'],
+                activeforeground=colors['text_primary'],
+                relief='flat',
+                bd=0,
+                command=lambda cell=cell: callback(cell),
+                cursor='hand2'
+            )
+            button.grid(row=row, column=col, padx=3, pady=3, sticky='nsew')
+            button.bind('<Enter>', lambda e, cell=cell: self.hover(cell))
+            button.bind('<Leave>', lambda e: self.hover(None))
+            self.buttons.append(button)
+
+        cell_size = 240 // size
+        for i in range(size):
+            parent.grid_rowconfigure(i, weight=1, minsize=cell_size)
+            parent.grid_columnconfigure(i, weight=1, minsize=cell_size)
+
+    def draw_cell(self, cell, state):
+        kind, text = state
+        self.buttons[cell].config(
+            text=text,
+            state='normal' if kind == EMPTY else 'disabled',
+            bg=self.fill(cell, kind),
+            disabledforeground=self.text_colors[kind],
+            font=self.empty_font if kind == EMPTY else self.mark_font
+        )
+
+
+class CanvasBoardView(BoardView):
+    def __init__(self, parent, colors, size, callback):
+        super().__init__(colors, size, callback)
+        self.pitch = BOARD_PIXELS // size
+        # a negative size is in pixels, so marks scale with the cells
+        self.mark_font = tkfont.Font(family='Segoe UI', size=-max(8, self.pitch * 3 // 5), weight='bold')
+
+        side = self.pitch * size
+        self.canvas = tk.Canvas(parent, width=side, height=side, bg=colors['bg_secondary'],
+                                highlightthickness=0, cursor='hand2')
+        self.canvas.pack()
+
+        self.rects = []
+        self.texts = []
+        inset = CELL_GAP // 2
+        for cell in range(size * size):
+            row, col = divmod(cell, size)
+            x, y = col * self.pitch, row * self.pitch
+            self.rects.append(self.canvas.create_rectangle(
+                x + inset, y + inset, x + self.pitch - inset, y + self.pitch - inset,
+                fill=colors['bg_tertiary'], width=0))
+            self.texts.append(self.canvas.create_text(
+                x + self.pitch // 2, y + self.pitch // 2, text='', font=self.mark_font,
+                fill=colors['text_primary']))
+
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<Motion>', lambda event: self.hover(self.cell_at(event.x, event.y)))
+        self.canvas.bind('<Leave>', lambda event: self.hover(None))
+
+    def cell_at(self, x, y):
+        row, col = y // self.pitch, x // self.pitch
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return row * self.size + col
+        return None
+
+    def on_click(self, event):
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None and self.states[cell][0] == EMPTY:
+            self.callback(cell)
+
+    def draw_cell(self, cell, state):
+        kind, text = state
+        self.canvas.itemconfigure(self.rects[cell], fill=self.fill(cell, kind))
+        self.canvas.itemconfigure(self.texts[cell], text=text.strip(), fill=self.text_colors[kind])
+
+
+def create_board_view(parent, colors, size, callback):
+    view_class = CanvasBoardView if size >= CANVAS_MIN_SIZE else ButtonBoardView
+    return view_class(parent, colors, size, callback)
@@ -0,0 +1,223 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+
+from game_logic import WIN_THRESHOLD, GameLogic, canonicalize, restore_cell, transform_cell
+
+MAGIC = b'TTTBOOK'
+VERSION = 2
+HEADER = struct.Struct('<7sHBBIx')  # magic, version, size, k, entry count
+
+
+def entry_format(size):
+    # canonical position key, score, canonical best move, exact flag; sorted by key. The key is
+    # stored big-endian in as many bytes as 2 * size * size bits need, so byte order is key order
+    return struct.Struct(f'<{key_bytes(size)}siBB')
+
+
+def key_bytes(size):
+    return (2 * size * size + 7) // 8
+
+
+class BookError(Exception):
+    pass
+
+
+def position_key(own_bits, opponent_bits, size):
+    # the canonical bitboard pair packed into one integer: a collision-free position hash
+    (own_bits, opponent_bits), symmetry = canonicalize(own_bits, opponent_bits, size)
+    return own_bits << (size * size) | opponent_bits, symmetry
+
+
+class OpeningBook:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:
+            self.file.close()
+            raise BookError(f"{path} is not an opening book")
+
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.k, self.count = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            self.close()
+            raise BookError(f"{path} is not an opening book")
+        if version != VERSION:
+            self.close()
+            raise BookError(f"{path} has book format {version}, expected {VERSION}; rebuild it")
+        self.entry = entry_format(self.size)
+        self.key_bytes = key_bytes(self.size)
+        if len(self.map) < HEADER.size + self.count * self.entry.size:
+            self.close()
+            raise BookError(f"{path} is truncated")
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, own_bits, opponent_bits):
+        # (best move, score, exact) for the side to move, or None when the position is not in the book
+        key, symmetry = position_key(own_bits, opponent_bits, self.size)
+        key = key.to_bytes(self.key_bytes, 'big')
+        entry_size = self.entry.size
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * entry_size
+            if self.map[offset:offset + self.key_bytes] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self.count:
+            return None
+        entry_key, score, move, exact = self.entry.unpack_from(self.map, HEADER.size + low * entry_size)
+        if entry_key != key:
+            return None
+        return restore_cell(move, symmetry, self.size), score, bool(exact)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_book(path, size, k, entries):
+    entry = entry_format(size)
+    length = key_bytes(size)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, k, len(entries)))
+        for key in sorted(entries):
+            move, score, exact = entries[key]
+            f.write(entry.pack(key.to_bytes(length, 'big'), score, move, exact))
+
+
+def opening_positions(game, plies):
+    # every distinct position (up to symmetry) of the first `plies` plies with the AI to move
+    frontier = {(0, 0)}
+    for ply in range(plies + 1):
+        human_to_move = ply % 2 == 0
+        if not human_to_move:
+            yield from frontier
+        if ply == plies:
+            break
+
+        next_frontier = {}
+        for human_bits, ai_bits in frontier:
+            free = ~(human_bits | ai_bits) & game.full_mask
+            for cell in range(game.cells):
+                if not free >> cell & 1:
+                    continue
+                if human_to_move:
+                    child = (human_bits | 1 << cell, ai_bits)
+                else:
+                    child = (human_bits, ai_bits | 1 << cell)
+                if not is_terminal(game, *child):
+                    key, symmetry = canonicalize(child[0], child[1], game.size)
+                    next_frontier.setdefault(key, child)
+        frontier = set(next_frontier.values())
+
+
+def endgame_positions(game, max_empty, samples, rng):
+    # positions with few empty cells left and the AI to move, reached by random play
+    for _ in range(samples):
+        human_bits = ai_bits = 0
+        human_to_move = True
+        while True:
+            free = [cell for cell in range(game.cells) if not (human_bits | ai_bits) >> cell & 1]
+            if not human_to_move and len(free) <= max_empty:
+                yield human_bits, ai_bits
+                break
+            cell = rng.choice(free)
+            if human_to_move:
+                human_bits |= 1 << cell
+            else:
+                ai_bits |= 1 << cell
+            if is_terminal(game, human_bits, ai_bits):
+                break
+            human_to_move = not human_to_move
+
+
+def is_terminal(game, human_bits, ai_bits):
+    occupied = human_bits | ai_bits
+    return occupied == game.full_mask or any(
+        bits & mask == mask for bits in (human_bits, ai_bits) for mask in game.line_masks)
+
+
+def build_book(size, k, plies, endgame_empty, endgame_samples, time_limit, seed=0, progress=None):
+    game = GameLogic(size, k)
+    game.time_limit = time_limit
+    entries = {}
+
+    def add(human_bits, ai_bits):
+        key, symmetry = position_key(ai_bits, human_bits, size)
+        if key in entries:
+            return
+        game.reset_board()
+        for cell in range(game.cells):
+            if human_bits >> cell & 1:
+                game.push(cell, game.human)
+            elif ai_bits >> cell & 1:
+                game.push(cell, game.ai)
+
+        move, score, _ = game.search()
+        empty = game.cells - (human_bits | ai_bits).bit_count()
+        exact = abs(score) >= WIN_THRESHOLD or game.last_search_depth >= empty
+        entries[key] = (transform_cell(move, symmetry, size), score, exact)
+        if progress and len(entries) % 100 == 0:
+            progress(len(entries))
+
+    for position in opening_positions(game, plies):
+        add(*position)
+    if endgame_samples:
+        for position in endgame_positions(game, endgame_empty, endgame_samples, random.Random(seed)):
+            add(*position)
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect opening book / tablebase files")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="search positions with GameLogic and write a book")
+    build.add_argument('--size', type=int, default=3)
+    build.add_argument('--k', type=int, default=None)
+    build.add_argument('--plies', type=int, default=None,
+                       help="cover every position of the first PLIES plies (default: all of a 3x3 game, else 3)")
+    build.add_argument('--endgame-empty', type=int, default=6,
+                       help="near-terminal positions have at most this many empty cells")
+    build.add_argument('--endgame-samples', type=int, default=0,
+                       help="random games to sample near-terminal positions from")
+    build.add_argument('--time-limit', type=float, default=1.0, help="seconds per opening position")
+    build.add_argument('--seed', type=int, default=0)
+    build.add_argument('--output', '-o', required=True)
+
+    info = commands.add_parser('info', help="describe a book file")
+    info.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'info':
+        with OpeningBook(args.path) as book:
+            print(f"{args.path}: format {VERSION}, {book.size}x{book.size} k={book.k}, {len(book)} positions")
+        return
+
+    k = args.k or args.size
+    plies = args.plies if args.plies is not None else (args.size * args.size if args.size == 3 else 3)
+    started = time.perf_counter()
+    entries = build_book(args.size, k, plies, args.endgame_empty, args.endgame_samples, args.time_limit,
+                         args.seed, progress=lambda count: print(f"{count} positions...", flush=True))
+    write_book(args.output, args.size, k, entries)
+    exact = sum(1 for _, _, is_exact in entries.values() if is_exact)
+    print(f"wrote {len(entries)} positions ({exact} exact) to {args.output} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
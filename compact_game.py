@@ -0,0 +1,142 @@
+import functools
+from array import array
+from enum import IntEnum
+
+from game_logic import DIFFICULTY_STRENGTH, GameLogic, cell_lines, line_masks
+
+
+class Difficulty(IntEnum):
+    EASY = 0
+    MEDIUM = 1
+    HARD = 2
+
+    @property
+    def strength(self):
+        # the GameLogic strength preset the named level stands for
+        return DIFFICULTY_STRENGTH[self.name.capitalize()]
+
+
+class GameResult(IntEnum):
+    CONTINUE = 0
+    HUMAN_WIN = 1
+    AI_WIN = 2
+    TIE = 3
+
+
+RESULT_NAMES = {GameResult.CONTINUE: 'continue', GameResult.HUMAN_WIN: 'human_win',
+                GameResult.AI_WIN: 'ai_win', GameResult.TIE: 'tie'}
+
+
+class BoardShape:
+    __slots__ = ('size', 'k', 'cells', 'full_mask', 'line_masks', 'cell_masks', 'engine')
+
+    def __init__(self, size, k):
+        self.size = size
+        self.k = k
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.line_masks = line_masks(size, k)
+        self.cell_masks = tuple(tuple(self.line_masks[line] for line in lines) for lines in cell_lines(size, k))
+        self.engine = None
+
+
+@functools.lru_cache(maxsize=None)
+def board_shape(size=3, k=3):
+    return BoardShape(size, k)
+
+
+class CompactGame:
+    # one packed int for the board (human bits low, AI bits above them), enum codes, and a
+    # shared BoardShape, so a live game costs a few dozen bytes instead of a GameLogic
+    __slots__ = ('board', 'difficulty', 'result', 'stats', 'shape')
+
+    def __init__(self, size=3, k=None, difficulty=Difficulty.HARD):
+        self.shape = board_shape(size, size if k is None else k)
+        self.board = 0
+        self.difficulty = Difficulty(difficulty)
+        self.result = GameResult.CONTINUE
+        self.stats = array('I', (0, 0, 0))  # human wins, AI wins, ties
+
+    @property
+    def human_bits(self):
+        return self.board & self.shape.full_mask
+
+    @property
+    def ai_bits(self):
+        return self.board >> self.shape.cells
+
+    def reset_board(self):
+        self.board = 0
+        self.result = GameResult.CONTINUE
+
+    def reset_stats(self):
+        self.stats[0] = self.stats[1] = self.stats[2] = 0
+
+    def get_available_moves(self):
+        free = ~(self.human_bits | self.ai_bits) & self.shape.full_mask
+        return [i for i in range(self.shape.cells) if free >> i & 1]
+
+    def make_move(self, position, is_ai):
+        shape = self.shape
+        bit = 1 << position
+        if self.result != GameResult.CONTINUE or (self.human_bits | self.ai_bits) & bit:
+            return False
+
+        if is_ai:
+            self.board |= bit << shape.cells
+            bits = self.ai_bits
+        else:
+            self.board |= bit
+            bits = self.human_bits
+
+        # only lines through the new stone can have been completed
+        for mask in shape.cell_masks[position]:
+            if bits & mask == mask:
+                self.result = GameResult.AI_WIN if is_ai else GameResult.HUMAN_WIN
+                self.stats[self.result - 1] += 1
+                return True
+
+        if (self.human_bits | self.ai_bits) == shape.full_mask:
+            self.result = GameResult.TIE
+            self.stats[2] += 1
+        return True
+
+    def check_game_end(self):
+        return self.result
+
+    def get_winning_line(self):
+        if self.result == GameResult.HUMAN_WIN:
+            bits = self.human_bits
+        elif self.result == GameResult.AI_WIN:
+            bits = self.ai_bits
+        else:
+            return None
+
+        for mask in self.shape.line_masks:
+            if bits & mask == mask:
+                return [i for i in range(self.shape.cells) if mask >> i & 1]
+        return None
+
+    def get_ai_move(self, rng):
+        # rng supplies the random draws of the weaker levels: a random.Random, or a game's
+        # DecisionStream to play it like GameLogic would with that seed
+        if self.result != GameResult.CONTINUE or (self.human_bits | self.ai_bits) == self.shape.full_mask:
+            return None
+
+        shape = self.shape
+        if shape.engine is None:
+            shape.engine = GameLogic(shape.size, shape.k)
+        engine = shape.engine
+        engine.reset_board()
+        engine.set_strength(self.difficulty.strength)
+        for cell in range(shape.cells):
+            if self.human_bits >> cell & 1:
+                engine.push(cell, engine.human)
+            elif self.ai_bits >> cell & 1:
+                engine.push(cell, engine.ai)
+        engine.decisions = rng
+        return engine.get_ai_move()
+
+    def to_dict(self):
+        return {'board': self.board, 'difficulty': self.difficulty.name, 'result': RESULT_NAMES[self.result],
+                'stats': {'Human': self.stats[0], 'AI': self.stats[1], 'Tie': self.stats[2]}}
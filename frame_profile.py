@@ -0,0 +1,125 @@
+import argparse
+import heapq
+import itertools
+import random
+import sys
+import time
+
+from game_controller import AI_MOVE_BUDGET_MS, GameController
+from game_logic import GameLogic
+from scheduler import Scheduler, print_histogram
+
+# the driver pumps the event loop about this often, like a display refreshing at 60 Hz
+FRAME_MS = 16
+
+
+class HeadlessRoot:
+    # just enough of Tk's timer API to run the game flow without a display
+    def __init__(self):
+        self.timers = []
+        self.callbacks = {}
+        self.timer_ids = itertools.count(1)
+
+    def after(self, delay_ms, callback):
+        after_id = f"after#{next(self.timer_ids)}"
+        self.callbacks[after_id] = callback
+        heapq.heappush(self.timers, (time.perf_counter() + delay_ms / 1000, after_id))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def update(self):
+        now = time.perf_counter()
+        while self.timers and self.timers[0][0] <= now:
+            callback = self.callbacks.pop(heapq.heappop(self.timers)[1], None)
+            if callback is not None:
+                callback()
+
+
+class NullView:
+    def render_board(self, board, human, winning_line):
+        pass
+
+    def show_status(self, message, status_type):
+        pass
+
+    def show_thinking(self, active):
+        pass
+
+    def show_stats(self, text):
+        pass
+
+    def show_search_stats(self, summary):
+        pass
+
+
+def gui_app(options):
+    # needs a display; run under xvfb-run on a machine without one
+    from main import TicTacToeAI
+    app = TicTacToeAI(options.size, options.k, log_path=None, profile_timers=True, rng=random.Random(options.seed))
+    app.root.after_idle(app.first_frame)
+    return app.root, app.scheduler, app.controller, app.quit
+
+
+def headless_app(options):
+    root = HeadlessRoot()
+    scheduler = Scheduler(root, profile=True)
+    game_logic = GameLogic(options.size, options.k, rng=random.Random(options.seed))
+    controller = GameController(game_logic, NullView(), scheduler.after, cancel=scheduler.cancel)
+    return root, scheduler, controller, lambda: (controller.close(), scheduler.cancel_all())
+
+
+def play(root, controller, games, rng, frame_times):
+    # one frame is a pass of the event loop plus whatever input the simulated player feeds it
+    game_logic = controller.game_logic
+    finished = 0
+    while finished < games:
+        started = time.perf_counter()
+        root.update()
+        if controller.ai_timer is None:
+            if game_logic.game_over:
+                finished += 1
+                controller.new_game()
+            else:
+                controller.human_move(rng.choice(game_logic.get_available_moves()))
+        frame_times.append((time.perf_counter() - started) * 1000)
+        time.sleep(FRAME_MS / 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the game headlessly and report frame and timer costs")
+    parser.add_argument('--games', type=int, default=5)
+    parser.add_argument('--size', type=int, default=3, help="board is SIZE x SIZE cells")
+    parser.add_argument('--k', type=int, default=None, help="marks in a row needed to win (default: SIZE)")
+    parser.add_argument('--strength', type=int, default=100, help="0-100")
+    parser.add_argument('--budget-ms', type=float, default=AI_MOVE_BUDGET_MS, help="hard cap on each AI move")
+    parser.add_argument('--seed', type=int, default=0, help="seeds the simulated player and the AI's games")
+    parser.add_argument('--no-gui', action='store_true',
+                        help="use a fake root and skip tkinter (the default falls back to it without a display)")
+    args = parser.parse_args(argv)
+
+    app = None
+    if not args.no_gui:
+        try:
+            app = gui_app(args)
+        except Exception as error:
+            # tkinter missing or no display to open the window on
+            print(f"no Tk display ({error}); using a fake root", file=sys.stderr)
+    if app is None:
+        app = headless_app(args)
+    root, scheduler, controller, close = app
+    controller.game_logic.set_strength(args.strength)
+    controller.move_budget_ms = args.budget_ms
+
+    frame_times = []
+    try:
+        play(root, controller, args.games, random.Random(args.seed), frame_times)
+    finally:
+        close()
+    print_histogram("frame time", frame_times, sys.stdout)
+    scheduler.report(sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import os
+import queue
+import threading
+import time
+import traceback
+
+from game_log import GameLogWriter, game_record, load_stats, stats_reset_record
+
+# the AI searches for up to this long and, when paced, every move is shown after about this long
+AI_MOVE_BUDGET_MS = 800
+AI_POLL_MS = 30
+DEFAULT_LOG_PATH = os.path.join(os.path.expanduser('~'), '.tic_tac_toe_games.log')
+
+STATUS_MESSAGES = {
+    'player_turn': "Your turn! Make your move",
+    'ai_thinking': "AI is analyzing the board...",
+    'human_win': "VICTORY! You defeated the AI!",
+    'ai_win': "AI WINS! Better luck next time!",
+    'tie': " IT'S A TIE! Great game! ",
+}
+STATS_KEYS = {'human_win': 'Human', 'ai_win': 'AI', 'tie': 'Tie'}
+
+
+class GameController:
+    # the game flow every front end shares. The view gets render_board, show_status,
+    # show_thinking, show_stats and show_search_stats calls; with a schedule(delay_ms,
+    # callback, *args) the AI searches on a worker thread, without one it searches inline.
+    # cancel(timer_id) drops the pending AI callback when a search is abandoned.
+    def __init__(self, game_logic, view, schedule=None, move_budget_ms=AI_MOVE_BUDGET_MS, paced=True,
+                 cancel=None):
+        self.game_logic = game_logic
+        self.view = view
+        self.schedule = schedule
+        self.cancel = cancel
+        self.ai_timer = None
+        self.move_budget_ms = move_budget_ms
+        self.paced = paced
+        self.game_log = None
+        self.game_started = time.time()
+        self.finished_result = None
+        self.finished_duration_ms = 0
+        self.ai_results = queue.Queue()
+        self.ai_search_id = 0
+        self.ai_search_logic = None
+        self.ai_search_started = 0.0
+
+    def open_log(self, path):
+        # games finished before the log was read are kept on top of its totals
+        stats = load_stats(path)
+        for result, count in self.game_logic.stats.items():
+            stats[result] += count
+        self.game_logic.stats = stats
+        self.game_log = GameLogWriter(path)
+        self.view.show_stats(self.game_logic.get_formatted_stats())
+
+    def human_move(self, position):
+        if self.ai_search_logic is not None:
+            return False
+
+        if not self.game_logic.make_move(position, self.game_logic.human):
+            return False
+
+        self.refresh_board()
+
+        game_result = self.game_logic.check_game_end()
+        if game_result != 'continue':
+            self.handle_game_end(game_result)
+        else:
+            self.start_ai_turn()
+        return True
+
+    def start_ai_turn(self):
+        self.view.show_status(STATUS_MESSAGES['ai_thinking'], 'ai_thinking')
+        self.view.show_thinking(True)
+        self.ai_search_id += 1
+        self.ai_search_started = time.perf_counter()
+
+        if self.schedule is None:
+            ai_move = self.game_logic.get_ai_move(deadline_ms=self.move_budget_ms)
+            self.execute_ai_move(self.ai_search_id, ai_move)
+            return
+
+        self.ai_search_logic = self.game_logic.clone()
+        threading.Thread(
+            target=self.run_ai_search,
+            args=(self.ai_search_id, self.ai_search_logic),
+            daemon=True
+        ).start()
+        self.ai_timer = self.schedule(AI_POLL_MS, self.poll_ai_search, self.ai_search_id)
+
+    def run_ai_search(self, search_id, search_logic):
+        # worker thread: never touch the view here, only hand the result back; a failed
+        # search still answers, with the first free cell, or the UI would wait for it forever
+        try:
+            self.ai_results.put((search_id, search_logic.get_ai_move(deadline_ms=self.move_budget_ms), None))
+        except Exception as error:
+            traceback.print_exc()
+            available_moves = search_logic.get_available_moves()
+            self.ai_results.put((search_id, available_moves[0] if available_moves else None, error))
+
+    def poll_ai_search(self, search_id):
+        if search_id != self.ai_search_id:
+            return
+
+        try:
+            result_id, ai_move, error = self.ai_results.get_nowait()
+        except queue.Empty:
+            self.ai_timer = self.schedule(AI_POLL_MS, self.poll_ai_search, search_id)
+            return
+
+        if result_id != search_id:
+            # a cancelled search finishing late
+            self.ai_timer = self.schedule(0, self.poll_ai_search, search_id)
+            return
+
+        delay_ms = 0
+        if self.paced:
+            elapsed_ms = (time.perf_counter() - self.ai_search_started) * 1000
+            delay_ms = max(0, int(self.move_budget_ms - elapsed_ms))
+        self.ai_timer = self.schedule(delay_ms, self.execute_ai_move, search_id, ai_move, error)
+
+    def cancel_ai_search(self):
+        self.ai_search_id += 1
+        if self.ai_timer is not None and self.cancel is not None:
+            self.cancel(self.ai_timer)
+        self.ai_timer = None
+        if self.ai_search_logic is not None:
+            self.ai_search_logic.cancel_search()
+            self.ai_search_logic = None
+
+    def execute_ai_move(self, search_id, ai_move, error=None):
+        if search_id != self.ai_search_id:
+            return
+
+        if self.ai_search_logic is not None:
+            # the search drew from a fork of the game's random stream
+            self.game_logic.decisions.position = self.ai_search_logic.decisions.position
+        self.ai_search_logic = None
+        self.ai_timer = None
+        self.view.show_thinking(False)
+        search_stats = self.game_logic.last_search_stats
+        if error is not None:
+            self.view.show_search_stats(f"AI search failed ({error!r}); it took the first free cell")
+        elif search_stats is not None:
+            self.view.show_search_stats(search_stats.summary())
+
+        if ai_move is not None:
+            self.game_logic.make_move(ai_move, self.game_logic.ai)
+            self.refresh_board()
+
+        self.handle_game_end(self.game_logic.check_game_end())
+
+    def handle_game_end(self, game_result):
+        # a finished game is logged only once it can no longer be undone (new game or close);
+        # undo comes back through here with 'continue' and retracts it
+        self.finished_result = None if game_result == 'continue' else game_result
+        if self.finished_result is not None:
+            self.finished_duration_ms = (time.time() - self.game_started) * 1000
+
+        self.refresh_board()
+        status_type = 'player_turn' if game_result == 'continue' else game_result
+        self.view.show_status(STATUS_MESSAGES[status_type], status_type)
+        self.view.show_stats(self.game_logic.get_formatted_stats())
+
+    def undo(self):
+        # take back the whole turn: any AI reply, then the human move before it
+        self.cancel_ai_search()
+        self.view.show_thinking(False)
+        while True:
+            move = self.game_logic.undo_move()
+            if move is None or move[1] == self.game_logic.human:
+                break
+
+        self.handle_game_end('continue')
+
+    def redo(self):
+        if self.ai_search_logic is not None:
+            return
+
+        game_result = 'continue'
+        last_player = None
+        while self.game_logic.redo_stack and game_result == 'continue':
+            position, last_player = self.game_logic.redo_move()
+            game_result = self.game_logic.check_game_end()
+            if last_player == self.game_logic.ai:
+                break
+
+        if last_player is None:
+            return
+
+        self.refresh_board()
+        if game_result == 'continue' and last_player == self.game_logic.human:
+            self.start_ai_turn()
+        else:
+            self.handle_game_end(game_result)
+
+    def refresh_board(self):
+        winning_line = self.game_logic.get_winning_line() if self.game_logic.game_over else None
+        self.view.render_board(self.game_logic.board, self.game_logic.human, winning_line)
+
+    def log_finished_game(self):
+        if self.finished_result is not None and self.game_log is not None:
+            self.game_log.append(game_record(self.game_logic, self.game_started, self.finished_duration_ms,
+                                             self.finished_result))
+        self.finished_result = None
+
+    def new_game(self):
+        self.cancel_ai_search()
+        self.log_finished_game()
+        self.game_logic.reset_board()
+        self.game_started = time.time()
+        self.view.show_thinking(False)
+        self.refresh_board()
+        self.view.show_status(STATUS_MESSAGES['player_turn'], 'player_turn')
+
+    def set_difficulty(self, difficulty):
+        self.game_logic.set_difficulty(difficulty)
+
+    def set_strength(self, strength):
+        self.game_logic.set_strength(strength)
+
+    def reset_stats(self):
+        self.game_logic.reset_stats()
+        if self.game_log is not None:
+            self.game_log.append(stats_reset_record(time.time()))
+        if self.finished_result is not None:
+            # the game on the board is logged after the marker, and undoing it takes it off again
+            self.game_logic.stats[STATS_KEYS[self.finished_result]] += 1
+        self.view.show_stats(self.game_logic.get_formatted_stats())
+
+    def close(self):
+        self.cancel_ai_search()
+        self.log_finished_game()
+        if self.game_log is not None:
+            self.game_log.close()
+            self.game_log = None
@@ -0,0 +1,274 @@
+import argparse
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+
+from compact_game import RESULT_NAMES, Difficulty, GameResult
+from game_logic import GameLogic
+
+MAGIC = b'TTTLOG'
+VERSION = 3
+HEADER = struct.Struct('<6sHH6x')  # magic, version, record size
+MAX_MOVES = 25  # enough for every board up to 5x5
+# started_at (unix seconds), game seed, duration_ms, size, k, difficulty, strength, result, move count,
+# moves, padding
+RECORD = struct.Struct(f'<dQIBBBBBB{MAX_MOVES}s5x')
+# version 1 had no seed and version 2 no strength; such logs are still read and appended to in
+# their own format
+RECORD_V1 = struct.Struct(f'<dIBBBBB{MAX_MOVES}s6x')
+RECORD_V2 = struct.Struct(f'<dQIBBBBB{MAX_MOVES}s6x')
+RECORD_FORMATS = {1: RECORD_V1, 2: RECORD_V2, 3: RECORD}
+STREAM_CHUNK_RECORDS = 1 << 16
+
+GameRecord = namedtuple('GameRecord', 'started_at duration_ms size k difficulty result moves seed strength',
+                        defaults=(None, None))
+RESULT_CODES = {name: code for code, name in RESULT_NAMES.items()}
+
+
+class GameLogError(Exception):
+    pass
+
+
+def pack_record(record, record_format=RECORD):
+    if len(record.moves) > MAX_MOVES:
+        raise GameLogError(f"a record holds at most {MAX_MOVES} moves, got {len(record.moves)}")
+    if record_format is RECORD_V1:
+        return RECORD_V1.pack(record.started_at, record.duration_ms, record.size, record.k, record.difficulty,
+                              record.result, len(record.moves), bytes(record.moves))
+    if record_format is RECORD_V2:
+        return RECORD_V2.pack(record.started_at, record.seed or 0, record.duration_ms, record.size, record.k,
+                              record.difficulty, record.result, len(record.moves), bytes(record.moves))
+    strength = Difficulty(record.difficulty).strength if record.strength is None else record.strength
+    return RECORD.pack(record.started_at, record.seed or 0, record.duration_ms, record.size, record.k,
+                       record.difficulty, strength, record.result, len(record.moves), bytes(record.moves))
+
+
+def unpack_record(fields):
+    seed = strength = None
+    if len(fields) == 8:
+        started_at, duration_ms, size, k, difficulty, result, move_count, moves = fields
+    elif len(fields) == 9:
+        started_at, seed, duration_ms, size, k, difficulty, result, move_count, moves = fields
+    else:
+        started_at, seed, duration_ms, size, k, difficulty, strength, result, move_count, moves = fields
+    return GameRecord(started_at, duration_ms, size, k, Difficulty(difficulty), GameResult(result),
+                      tuple(moves[:move_count]), seed, strength)
+
+
+def _check_header(data, path):
+    # the record layout the file was written with
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise GameLogError(f"{path} is not a game log")
+    record_format = RECORD_FORMATS.get(version)
+    if record_format is None or record_size != record_format.size:
+        raise GameLogError(f"{path} has log format {version} with {record_size}-byte records, "
+                           f"expected {VERSION} with {RECORD.size}")
+    return record_format
+
+
+class GameLogWriter:
+    # append() only queues the packed record; a background thread writes queued records in
+    # batches, so recording a game never waits on the disk
+    def __init__(self, path, flush_interval=1.0, batch_size=256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.pending = []
+        self.pending_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closed = False
+
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as f:
+                self.record_format = _check_header(f.read(HEADER.size), path)
+            self.file = open(path, 'ab')
+        else:
+            self.record_format = RECORD
+            self.file = open(path, 'ab')
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self.file.flush()
+
+        self.thread = threading.Thread(target=self._run, name='game-log-writer', daemon=True)
+        self.thread.start()
+
+    def append(self, record):
+        packed = pack_record(record, self.record_format)
+        with self.pending_lock:
+            self.pending.append(packed)
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.wake.set()
+
+    def flush(self):
+        with self.pending_lock:
+            batch = b''.join(self.pending)
+            self.pending.clear()
+        if batch:
+            with self.write_lock:
+                self.file.write(batch)
+                self.file.flush()
+
+    def _run(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GameLogReader:
+    # memory-maps the log as it is on open: random access by index, or stream with iteration
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        if size < HEADER.size:
+            self.file.close()
+            raise GameLogError(f"{path} is not a game log")
+
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.record_format = _check_header(self.map, path)
+        # a record still being written at the end is left out
+        self.count = (size - HEADER.size) // self.record_format.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("game log index out of range")
+        record_format = self.record_format
+        return unpack_record(record_format.unpack_from(self.map, HEADER.size + index * record_format.size))
+
+    def __iter__(self):
+        # copy a chunk at a time so no buffer into the map outlives a half-consumed iterator
+        record_format = self.record_format
+        for first in range(0, self.count, STREAM_CHUNK_RECORDS):
+            start = HEADER.size + first * record_format.size
+            end = HEADER.size + min(self.count, first + STREAM_CHUNK_RECORDS) * record_format.size
+            for fields in record_format.iter_unpack(self.map[start:end]):
+                yield unpack_record(fields)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def game_record(game, started_at, duration_ms, result):
+    return GameRecord(started_at, int(duration_ms), game.size, game.k,
+                      Difficulty[game.ai_difficulty.upper()], RESULT_CODES[result],
+                      tuple(position for position, *_ in game.move_history), game.game_seed, game.strength)
+
+
+def stats_reset_record(started_at):
+    # a marker rather than a game: totals read back from the log start again from zero after it
+    return GameRecord(started_at, 0, 0, 0, Difficulty.EASY, GameResult.CONTINUE, (), 0, 0)
+
+
+def _apply_strength(game, record):
+    # records before format 3 only know the named difficulty, which is a strength preset
+    game.set_strength(record.difficulty.strength if record.strength is None else record.strength)
+
+
+def replay(record):
+    game = GameLogic(record.size, record.k, seed=record.seed)
+    _apply_strength(game, record)
+    for index, position in enumerate(record.moves):
+        game.make_move(position, game.human if index % 2 == 0 else game.ai)
+    game.check_game_end()
+    return game
+
+
+def reproduce(record, time_limit=None):
+    # plays the recorded human moves against a fresh AI seeded like the original game and
+    # returns the index of the first AI move that differs, or None. Random moves replay from
+    # the seed and 3x3 moves from the solved table at any strength; searched moves match as long
+    # as the search gets at least as far as it did, which a cache warmed by earlier games can change.
+    if record.seed is None:
+        raise GameLogError("the record has no seed (written by log format 1)")
+    game = GameLogic(record.size, record.k, seed=record.seed)
+    _apply_strength(game, record)
+    game.time_limit = time_limit
+    for index, position in enumerate(record.moves):
+        if index % 2 == 0:
+            game.make_move(position, game.human)
+            continue
+        if game.get_ai_move() != position:
+            return index
+        game.make_move(position, game.ai)
+    return None
+
+
+def recompute_stats(records):
+    stats = {'Human': 0, 'AI': 0, 'Tie': 0}
+    for record in records:
+        if record.result == GameResult.CONTINUE:
+            stats = {'Human': 0, 'AI': 0, 'Tie': 0}
+        elif record.result == GameResult.HUMAN_WIN:
+            stats['Human'] += 1
+        elif record.result == GameResult.AI_WIN:
+            stats['AI'] += 1
+        elif record.result == GameResult.TIE:
+            stats['Tie'] += 1
+    return stats
+
+
+def load_stats(path):
+    if not os.path.exists(path):
+        return {'Human': 0, 'AI': 0, 'Tie': 0}
+    with GameLogReader(path) as reader:
+        return recompute_stats(reader)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect a game log")
+    parser.add_argument('command', choices=['stats', 'show'])
+    parser.add_argument('path')
+    parser.add_argument('--last', type=int, default=10, help="games to show (default 10)")
+    args = parser.parse_args(argv)
+
+    with GameLogReader(args.path) as reader:
+        if args.command == 'stats':
+            stats = recompute_stats(reader)
+            print(f"{len(reader)} games    YOU: {stats['Human']}    AI: {stats['AI']}    TIES: {stats['Tie']}")
+        else:
+            for index in range(max(0, len(reader) - args.last), len(reader)):
+                record = reader[index]
+                if record.result == GameResult.CONTINUE:
+                    print(f"#{index} stats reset")
+                    continue
+                board = ''.join('.' if mark == ' ' else mark for mark in replay(record).board)
+                seed = 'no seed' if record.seed is None else f"seed {record.seed}"
+                level = record.difficulty.name.lower() if record.strength is None else f"strength {record.strength}"
+                print(f"#{index} {record.size}x{record.size} k={record.k} {level} "
+                      f"{RESULT_NAMES[record.result]} {record.duration_ms} ms {seed} {board}")
+
+
+if __name__ == "__main__":
+    main()
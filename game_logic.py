@@ -1,116 +1,872 @@
+import functools
 import math
 import random
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
 
 
-class GameLogic:
+@functools.lru_cache(maxsize=None)
+def line_masks(size=3, k=3):
+    directions = ((0, 1), (1, 0), (1, 1), (1, -1))  # rows, columns, diagonals, anti-diagonals
+    masks = []
+    for dr, dc in directions:
+        for row in range(size):
+            for col in range(size):
+                end_row = row + dr * (k - 1)
+                end_col = col + dc * (k - 1)
+                if not (0 <= end_row < size and 0 <= end_col < size):
+                    continue
+                mask = 0
+                for step in range(k):
+                    mask |= 1 << ((row + dr * step) * size + col + dc * step)
+                masks.append(mask)
+    return tuple(masks)
+
+
+WIN_MASKS = line_masks(3, 3)
+FULL_MASK = 0b111111111
+
+# win scores stay above this however deep the search goes, heuristic scores stay below it
+WIN_SCORE = 1_000_000
+WIN_THRESHOLD = WIN_SCORE - 1000
+
+# canonical (side-to-move bits, opponent bits) -> (score, best moves), shared by every game
+_SOLVED_TABLE = {}
+_SOLVED_LOCK = threading.Lock()
+# per-move scores of 3x3 positions as played, for the weaker levels; a few thousand at most
+_MOVE_SCORES = {}
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+MOVE_TIER = 1 << 30
+# nodes between clock reads on 3x3 when a search has a deadline; bigger boards cost more
+# per node, so they read it proportionally more often to return on time
+CLOCK_CHECK_NODES = 32
+
+MAX_STRENGTH = 100
+DIFFICULTY_STRENGTH = {'Easy': 20, 'Medium': 50, 'Hard': MAX_STRENGTH}
+# chance at strength 0 that a 3x3 move settles for a worse outcome than the best one
+STRENGTH_SLIP = 0.5
+# heuristic noise at strength 0; a line holding k - 1 stones weighs 4 ** (k - 1)
+STRENGTH_NOISE = 64
+# nodes a strength-0 search may visit; the budget doubles every 10 strength points
+STRENGTH_NODES = 50
+
+
+# score is from the mover's side; result ('win', 'loss', 'draw') and plies to it once proven
+MoveAnalysis = namedtuple('MoveAnalysis', 'move score result plies')
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class PositionCache:
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # a background search and the UI thread (hints, analysis) can use the cache together
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+    def peek(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+class SearchStats:
     def __init__(self):
-        self.board = [' ' for _ in range(9)]
+        self.nodes = 0
+        self.cutoffs = 0
+        self.max_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.seconds = 0.0
+        self.move = None
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def summary(self):
+        return (f"{self.nodes} nodes, {self.cutoffs} cutoffs, depth {self.max_depth}, "
+                f"{self.cache_hits} cache hits, {self.seconds * 1000:.1f} ms")
+
+
+class DecisionStream:
+    # the random numbers one game's AI decisions draw on, generated up front from the game's
+    # seed: batch runs never touch a shared generator and a recorded seed replays the game
+    def __init__(self, seed, length=16):
+        self.seed = seed
+        self.source = random.Random(seed)
+        self.values = [self.source.random() for _ in range(length)]
+        self.position = 0
+
+    def random(self):
+        # position may have been carried over from a fork that read further ahead
+        while self.position >= len(self.values):
+            self.values.extend(self.source.random() for _ in range(len(self.values)))
+        value = self.values[self.position]
+        self.position += 1
+        return value
+
+    def choice(self, sequence):
+        return sequence[int(self.random() * len(sequence))]
+
+    def fork(self):
+        # an independent reader at the same point, for a search that may be abandoned
+        other = type(self).__new__(type(self))
+        other.seed = self.seed
+        other.source = random.Random()
+        other.source.setstate(self.source.getstate())
+        other.values = list(self.values)
+        other.position = self.position
+        return other
+
+
+class GameLogic:
+    def __init__(self, size=3, k=None, rng=None, seed=None):
+        if k is None:
+            k = size
+        if not 1 <= k <= size:
+            raise ValueError(f"k must be between 1 and the board size, got {k}")
+
+        self.size = size
+        self.k = k
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.line_masks = line_masks(size, k)
+        self.cell_lines = cell_lines(size, k)
+        self.line_weights = tuple(4 ** count for count in range(k + 1))
+        self.move_order = move_order(size, k)
         self.human = 'X'
         self.ai = 'O'
+        self.bitboards = {self.human: 0, self.ai: 0}
+        # stones per player on each line, updated only along the lines through each move
+        self.line_counts = {self.human: [0] * len(self.line_masks), self.ai: [0] * len(self.line_masks)}
+        self.move_history = []
+        self.redo_stack = []
+        self.zobrist_keys = dict(zip((self.human, self.ai), zobrist_keys(self.cells)))
+        self.zobrist_hash = 0
+        self.winner = None
+        self.winning_line = None
         self.current_player = self.human
         self.game_over = False
         self.ai_difficulty = 'Hard'
+        self.strength = MAX_STRENGTH
+        # rng only hands out game seeds (and drives MCTS); each game's own decisions replay from its seed
+        self.rng = rng if rng is not None else random.Random()
+        self.game_seed = None
+        self.decisions = None
+        self.seed_game(seed)
+        self.max_depth = None
+        self.time_limit = 1.0
+        self.search_cancelled = False
+        self.last_search_depth = 0
+        self._deadline = None
+        self._clock_interval = max(1, CLOCK_CHECK_NODES * 9 // self.cells)
+        self._clock_countdown = self._clock_interval
+        self._root_best = None
+        self._node_budget = None
+        self._noise = 0
+        self._strength_cache = None
+        self.book = None
+        # None plays the built-in minimax; otherwise any object with choose_move(game, deadline)
+        self.strategy = None
+        self._depth_limit = self.cells + 1
+        self._killers = [[None, None] for _ in range(self.cells + 2)]
+        self._history = [0] * self.cells
+        self._move_priority = [0] * self.cells
+        self.search_stats = None
         self.stats = {'Human': 0, 'AI': 0, 'Tie': 0}
+        self.position_cache = PositionCache()
+
+    @property
+    def board(self):
+        human_bits = self.bitboards[self.human]
+        ai_bits = self.bitboards[self.ai]
+        return [self.human if human_bits >> i & 1 else self.ai if ai_bits >> i & 1 else ' '
+                for i in range(self.cells)]
+
+    def clone(self):
+        # an independent copy of the position for searching off the UI thread; the cache is shared
+        other = type(self)(self.size, self.k, self.rng, self.game_seed)
+        other.human = self.human
+        other.ai = self.ai
+        # a fork, so an abandoned search uses up nothing; whoever applies the clone's move
+        # carries its decisions.position over
+        other.decisions = self.decisions.fork()
+        other.bitboards = dict(self.bitboards)
+        other.line_counts = {player: list(counts) for player, counts in self.line_counts.items()}
+        other.move_history = list(self.move_history)
+        other.redo_stack = list(self.redo_stack)
+        other.zobrist_hash = self.zobrist_hash
+        other.winner = self.winner
+        other.winning_line = self.winning_line
+        other.current_player = self.current_player
+        other.game_over = self.game_over
+        other.ai_difficulty = self.ai_difficulty
+        other.strength = self.strength
+        other.max_depth = self.max_depth
+        other.time_limit = self.time_limit
+        other.position_cache = self.position_cache
+        if self.strength < MAX_STRENGTH:
+            # made here rather than in the clone, so that what its search stores stays with the game
+            self._level_cache()
+        other._strength_cache = self._strength_cache
+        other.book = self.book
+        other.strategy = self.strategy
+        if self.search_stats is not None:
+            other.enable_search_stats(self.search_stats)
+        return other
+
+    def enable_search_stats(self, history=None):
+        # the counting wrappers shadow the plain methods on this instance only, so a
+        # game without stats runs exactly the uninstrumented code
+        self.search_stats = history if history is not None else deque(maxlen=1000)
+        self.get_ai_move = self._timed_get_ai_move
+        self._minimax = self._counted_minimax
+
+    def disable_search_stats(self):
+        self.search_stats = None
+        self.__dict__.pop('get_ai_move', None)
+        self.__dict__.pop('_minimax', None)
+
+    @property
+    def last_search_stats(self):
+        return self.search_stats[-1] if self.search_stats else None
+
+    def _timed_get_ai_move(self, deadline_ms=None):
+        stats = self._current_search_stats = SearchStats()
+        counts = [(cache, cache.hits, cache.misses) for cache in self._search_caches()]
+        started = time.perf_counter()
+
+        stats.move = type(self).get_ai_move(self, deadline_ms)
+
+        stats.seconds = time.perf_counter() - started
+        for cache in self._search_caches():
+            # a weakened search may have started a new cache of its own during the move
+            hits, misses = next(((hits, misses) for seen, hits, misses in counts if seen is cache), (0, 0))
+            stats.cache_hits += cache.hits - hits
+            stats.cache_misses += cache.misses - misses
+        self.search_stats.append(stats)
+        return stats.move
+
+    def _search_caches(self):
+        # the full-strength cache and the one weakened searches swap in
+        if self._strength_cache is None:
+            return (self.position_cache,)
+        return (self.position_cache, self._strength_cache[1])
+
+    def _counted_minimax(self, ai_bits, human_bits, depth, is_maximizing, alpha, beta):
+        stats = self._current_search_stats
+        stats.nodes += 1
+        if depth + 1 > stats.max_depth:
+            stats.max_depth = depth + 1
+
+        score = type(self)._minimax(self, ai_bits, human_bits, depth, is_maximizing, alpha, beta)
+
+        # the result falls outside the window: the parent either cuts off or, after a
+        # null-window probe, re-searches the move
+        if score <= alpha if is_maximizing else score >= beta:
+            stats.cutoffs += 1
+        return score
+
+    def cancel_search(self):
+        self.search_cancelled = True
+
+    def seed_game(self, seed=None):
+        self.game_seed = seed if seed is not None else self.rng.getrandbits(64)
+        self.decisions = DecisionStream(self.game_seed, self.cells)
 
-    def reset_board(self):
-        self.board = [' ' for _ in range(9)]
+    def reset_board(self, seed=None):
+        self.bitboards[self.human] = 0
+        self.bitboards[self.ai] = 0
+        for counts in self.line_counts.values():
+            for line in range(len(counts)):
+                counts[line] = 0
+        self.move_history.clear()
+        self.redo_stack.clear()
+        self.zobrist_hash = 0
+        self.winner = None
+        self.winning_line = None
         self.game_over = False
         self.current_player = self.human
+        self.seed_game(seed)
 
     def reset_stats(self):
         self.stats = {'Human': 0, 'AI': 0, 'Tie': 0}
 
+    def _occupied(self):
+        return self.bitboards[self.human] | self.bitboards[self.ai]
+
     def make_move(self, position, player):
-        if self.game_over or self.board[position] != ' ':
+        if self.game_over or self._occupied() & 1 << position:
             return False
 
-        self.board[position] = player
+        self.push(position, player)
+        self.redo_stack.clear()
         return True
 
+    def push(self, position, player):
+        # unchecked: callers make sure the cell is empty
+        self.bitboards[player] |= 1 << position
+        self.zobrist_hash ^= self.zobrist_keys[player][position]
+        # with the random draws used up so far, so undo can rewind them and a replay stays in step
+        self.move_history.append((position, player, self.winner, self.winning_line, self.decisions.position))
+
+        counts = self.line_counts[player]
+        for line in self.cell_lines[position]:
+            counts[line] += 1
+            if counts[line] == self.k and self.winner is None:
+                self.winner = player
+                self.winning_line = line
+
+    def pop(self):
+        position, player, self.winner, self.winning_line, _ = self.move_history.pop()
+        self.decisions.position = self.move_history[-1][4] if self.move_history else 0
+        self.bitboards[player] &= ~(1 << position)
+        self.zobrist_hash ^= self.zobrist_keys[player][position]
+
+        counts = self.line_counts[player]
+        for line in self.cell_lines[position]:
+            counts[line] -= 1
+        return position, player
+
+    def undo_move(self):
+        if not self.move_history:
+            return None
+
+        if self.game_over:
+            # the finished game was counted by check_game_end; it is back in play now
+            if self.winner == self.human:
+                self.stats['Human'] -= 1
+            elif self.winner == self.ai:
+                self.stats['AI'] -= 1
+            else:
+                self.stats['Tie'] -= 1
+            self.game_over = False
+
+        draws = self.move_history[-1][4]
+        move = self.pop()
+        self.redo_stack.append(move + (draws,))
+        return move
+
+    def redo_move(self):
+        if not self.redo_stack or self.game_over:
+            return None
+
+        position, player, draws = self.redo_stack.pop()
+        self.decisions.position = draws
+        self.push(position, player)
+        return position, player
+
     def get_available_moves(self):
-        return [i for i, spot in enumerate(self.board) if spot == ' ']
+        free = ~self._occupied() & self.full_mask
+        return [i for i in range(self.cells) if free >> i & 1]
 
-    def get_ai_move(self):
+    def get_ai_move(self, deadline_ms=None):
+        # with deadline_ms the move is returned within that many milliseconds, searched or not
         available_moves = self.get_available_moves()
 
         if not available_moves:
             return None
 
-        if self.ai_difficulty == 'Easy':
-            if random.random() < 0.7:
-                return random.choice(available_moves)
-        elif self.ai_difficulty == 'Medium':
-            if random.random() < 0.3:
-                return random.choice(available_moves)
+        deadline = None if deadline_ms is None else time.perf_counter() + deadline_ms / 1000
 
-        return self._get_best_move()
+        if self.strategy is not None:
+            # the strategy turns the difficulty into a compute budget instead of a coin flip
+            return self.strategy.choose_move(self, deadline)
 
-    def _get_best_move(self):
-        available_moves = self.get_available_moves()
+        if self.strength < MAX_STRENGTH:
+            return self._play_at_strength(available_moves, deadline)
+
+        return self._get_best_move(deadline)
+
+    def _play_at_strength(self, available_moves, deadline):
+        # a weaker level searches less (shallower, fewer nodes) and sees a noisier
+        # evaluation, so it also costs less than Hard; at the bottom it sometimes blunders
+        depth, noise, node_budget, blunder_chance = strength_profile(self.strength)
+        if blunder_chance and self.decisions.random() < blunder_chance:
+            return self.decisions.choice(available_moves)
+
+        if self.size == 3 and self.k == 3:
+            return self._play_solved_at_strength()
+
+        max_depth = self.max_depth
+        position_cache = self.position_cache
+        self.position_cache = self._level_cache()
+        self.max_depth = depth if max_depth is None else min(max_depth, depth)
+        self._node_budget = node_budget
+        self._noise = noise
+        self._heuristic = self._noisy_heuristic
+        try:
+            return self.search(deadline)[0]
+        finally:
+            del self._heuristic
+            self._noise = 0
+            self._node_budget = None
+            self.max_depth = max_depth
+            self.position_cache = position_cache
+
+    def _level_cache(self):
+        # noisy scores must not leak into the cache that full-strength searches use; the
+        # noise depends only on the level, so they stay valid from one game to the next
+        if self._strength_cache is None or self._strength_cache[0] != self.strength:
+            self._strength_cache = (self.strength, PositionCache(10_000))
+        return self._strength_cache[1]
+
+    def _play_solved_at_strength(self):
+        # 3x3 needs no search: the solved table gives every move's outcome, and each strength point
+        # below the maximum adds half a percent to the chance of settling for the next worse one
+        # (a draw instead of a win, a loss instead of a draw), drawn again for every step down
+        slip = STRENGTH_SLIP * (MAX_STRENGTH - self.strength) / MAX_STRENGTH
+        scores = solved_move_scores(self.bitboards[self.ai], self.bitboards[self.human])
+        outcomes = sorted({(score > 0) - (score < 0) for _, score in scores}, reverse=True)
+        level = 0
+        while level + 1 < len(outcomes) and self.decisions.random() < slip:
+            level += 1
+        # within that outcome the quickest win or the slowest loss, as Hard plays it
+        best_move = None
         best_score = -math.inf
+        for move, score in scores:
+            if (score > 0) - (score < 0) == outcomes[level] and score > best_score:
+                best_move = move
+                best_score = score
+        return best_move
+
+    def set_strategy(self, strategy, **options):
+        if strategy == 'minimax':
+            strategy = None
+        elif strategy == 'mcts':
+            from mcts import MCTSStrategy
+            strategy = MCTSStrategy(**options)
+        elif isinstance(strategy, str):
+            raise ValueError(f"unknown strategy {strategy!r}")
+        self.strategy = strategy
+
+    def load_book(self, path):
+        from book import OpeningBook
+
+        book = OpeningBook(path)
+        if (book.size, book.k) != (self.size, self.k):
+            book.close()
+            raise ValueError(f"{path} is a {book.size}x{book.size} k={book.k} book, "
+                             f"this game is {self.size}x{self.size} k={self.k}")
+        self.book = book
+
+    def _get_best_move(self, deadline=None):
+        if self.book is not None:
+            entry = self.book.lookup(self.bitboards[self.ai], self.bitboards[self.human])
+            if entry is not None:
+                return entry[0]
+
+        if self.size == 3 and self.k == 3:
+            score, best_moves = solved_position(self.bitboards[self.ai], self.bitboards[self.human])
+            return best_moves[0]
+
+        return self._search_best_move(deadline)
+
+    def _search_best_move(self, deadline=None):
+        return self.search(deadline)[0]
+
+    def search(self, deadline=None):
+        # iterative deepening from the current position with the AI to move;
+        # returns (best move, score, principal variation). A deadline (a time.perf_counter()
+        # value) aborts the iteration in progress and keeps the best move found so far.
+        ai_bits = self.bitboards[self.ai]
+        human_bits = self.bitboards[self.human]
+        available_moves = self.get_available_moves()
+        max_depth = len(available_moves)
+        if self.max_depth is not None:
+            max_depth = min(self.max_depth, max_depth)
+
+        self._reset_move_ordering()
+        started = time.perf_counter()
         best_move = available_moves[0]
+        best_score = 0
+        self.last_search_depth = 0
+        self._deadline = deadline
+        self._clock_countdown = self._clock_interval
+        try:
+            for depth_limit in range(1, max_depth + 1):
+                self._check_clock()
+                self._root_best = None
+                best_move, best_score = self._search_root(ai_bits, human_bits, best_move, depth_limit)
+                self.last_search_depth = depth_limit
+                if abs(best_score) >= WIN_THRESHOLD:
+                    break
+                if self.time_limit is not None and time.perf_counter() - started >= self.time_limit:
+                    break
+        except SearchCancelled:
+            # the previous best is searched first, so whatever leads the unfinished
+            # iteration has been searched deeper than the last completed one
+            if self._root_best is not None:
+                best_move, best_score = self._root_best
+        finally:
+            self.search_cancelled = False
+            self._deadline = None
+            self._root_best = None
 
-        for move in available_moves:
-            self.board[move] = self.ai
-            score = self._minimax(0, False, -math.inf, math.inf)
-            self.board[move] = ' '
+        return best_move, best_score, self._principal_variation(ai_bits, human_bits, best_move)
+
+    def analyze(self, board=None, deadline_ms=None):
+        # every legal move for the side to move, best first; X moves first, so equal
+        # counts mean X is to move. board is a sequence of marks, ' ' or '.' for empty.
+        if board is None:
+            human_bits, ai_bits = self.bitboards[self.human], self.bitboards[self.ai]
+        else:
+            human_bits = ai_bits = 0
+            for cell, mark in enumerate(board):
+                if mark == self.human:
+                    human_bits |= 1 << cell
+                elif mark == self.ai:
+                    ai_bits |= 1 << cell
+
+        if human_bits.bit_count() == ai_bits.bit_count():
+            own_bits, opponent_bits = human_bits, ai_bits
+        else:
+            own_bits, opponent_bits = ai_bits, human_bits
+        occupied = own_bits | opponent_bits
+        if (occupied == self.full_mask or _has_line(own_bits, self.line_masks)
+                or _has_line(opponent_bits, self.line_masks)):
+            return []
+
+        moves = [cell for cell in self.move_order if not occupied >> cell & 1]
+        max_depth = len(moves)
+        if self.max_depth is not None:
+            max_depth = min(self.max_depth, max_depth)
+
+        # the search only knows a maximizing and a minimizing side, so the mover plays the
+        # maximizing part and cache entries stay valid for ordinary AI searches
+        self._reset_move_ordering()
+        started = time.perf_counter()
+        deadline = None if deadline_ms is None else started + deadline_ms / 1000
+        self._clock_countdown = self._clock_interval
+        scores = {}
+        self.last_search_depth = 0
+        try:
+            for depth_limit in range(1, max_depth + 1):
+                # depth 1 always completes so every move gets a score
+                self._deadline = deadline if depth_limit > 1 else None
+                self._check_clock()
+                self._depth_limit = depth_limit
+                scores = {move: self._minimax(own_bits | 1 << move, opponent_bits, 0, False, -math.inf, math.inf)
+                          for move in moves}
+                self.last_search_depth = depth_limit
+                if all(abs(score) >= WIN_THRESHOLD for score in scores.values()):
+                    break
+                if self.time_limit is not None and time.perf_counter() - started >= self.time_limit:
+                    break
+        except SearchCancelled:
+            pass
+        finally:
+            self.search_cancelled = False
+            self._deadline = None
+
+        solved = self.last_search_depth >= len(moves)
+        analysis = []
+        for move, score in scores.items():
+            if score >= WIN_THRESHOLD:
+                analysis.append(MoveAnalysis(move, score, 'win', WIN_SCORE - score + 1))
+            elif score <= -WIN_THRESHOLD:
+                analysis.append(MoveAnalysis(move, score, 'loss', WIN_SCORE + score + 1))
+            elif solved:
+                analysis.append(MoveAnalysis(move, score, 'draw', len(moves)))
+            else:
+                analysis.append(MoveAnalysis(move, score, None, None))
+        analysis.sort(key=lambda entry: -entry.score)
+        return analysis
+
+    def _reset_move_ordering(self):
+        for killers in self._killers:
+            killers[0] = killers[1] = None
+        for cell in range(self.cells):
+            self._history[cell] = 0
+
+    def _search_root(self, ai_bits, human_bits, previous_best, depth_limit):
+        key, symmetry = canonicalize(ai_bits, human_bits, self.size)
+        key += (True,)
+        draft = depth_limit
+
+        entry = self.position_cache.get(key)
+        if entry is not None and entry[1] == EXACT and entry[3] >= draft:
+            # the root sits one ply above the depth-0 children
+            return restore_cell(entry[2], symmetry, self.size), _uncache_score(entry[0], -1)
+
+        self._depth_limit = depth_limit
+        best_score = -math.inf
+        best_move = None
+
+        for move in self._ordered_moves(ai_bits, human_bits, -1, previous_best):
+            child_bits = ai_bits | 1 << move
+            if best_move is None:
+                score = self._minimax(child_bits, human_bits, 0, False, best_score, math.inf)
+            else:
+                # a root move can be a large subtree, so time is also read between them
+                self._check_clock()
+                # principal variation search: prove the other moves are no better with a null window
+                score = self._minimax(child_bits, human_bits, 0, False, best_score, best_score + 1)
+                if score > best_score:
+                    score = self._minimax(child_bits, human_bits, 0, False, best_score, math.inf)
 
             if score > best_score:
                 best_score = score
                 best_move = move
+                self._root_best = (move, score)
 
-        return best_move
+        self.position_cache.put(key, (_cache_score(best_score, -1), EXACT,
+                                      transform_cell(best_move, symmetry, self.size), draft))
+        return best_move, best_score
+
+    def _check_clock(self):
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchCancelled
 
-    def _minimax(self, depth, is_maximizing, alpha, beta):
-        winner = self.evaluate_board()
+    def _minimax(self, ai_bits, human_bits, depth, is_maximizing, alpha, beta):
+        if self.search_cancelled:
+            raise SearchCancelled
+        self._clock_countdown -= 1
+        if not self._clock_countdown:
+            self._clock_countdown = self._clock_interval
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchCancelled
+            if self._node_budget is not None:
+                self._node_budget -= self._clock_interval
+                if self._node_budget <= 0:
+                    raise SearchCancelled
 
-        if winner == self.ai:
-            return 10 - depth
-        elif winner == self.human:
-            return depth - 10
-        elif ' ' not in self.board:
+        # only the side that just moved can have completed a line
+        if is_maximizing:
+            if _has_line(human_bits, self.line_masks):
+                return depth - WIN_SCORE
+        elif _has_line(ai_bits, self.line_masks):
+            return WIN_SCORE - depth
+
+        occupied = ai_bits | human_bits
+        if occupied == self.full_mask:
             return 0
 
         if is_maximizing:
-            max_score = -math.inf
-            for i in range(9):
-                if self.board[i] == ' ':
-                    self.board[i] = self.ai
-                    score = self._minimax(depth + 1, False, alpha, beta)
-                    self.board[i] = ' '
-                    max_score = max(score, max_score)
-                    alpha = max(alpha, score)
-                    if beta <= alpha:
-                        break
-            return max_score
+            own_bits, opponent_bits = ai_bits, human_bits
         else:
-            min_score = math.inf
-            for i in range(9):
-                if self.board[i] == ' ':
-                    self.board[i] = self.human
-                    score = self._minimax(depth + 1, True, alpha, beta)
-                    self.board[i] = ' '
-                    min_score = min(score, min_score)
+            own_bits, opponent_bits = human_bits, ai_bits
+
+        if self._threats(own_bits, opponent_bits):
+            # a line completes on the next ply and nothing scores better than that
+            return WIN_SCORE - depth - 1 if is_maximizing else depth + 1 - WIN_SCORE
+        blocks = self._threats(opponent_bits, own_bits)
+        if blocks & (blocks - 1):
+            # two open threats cannot both be blocked
+            return depth + 2 - WIN_SCORE if is_maximizing else WIN_SCORE - depth - 2
+
+        draft = self._depth_limit - depth - 1
+        if draft <= 0:
+            return self._heuristic(ai_bits, human_bits)
+
+        key, symmetry = canonicalize(ai_bits, human_bits, self.size)
+        key += (is_maximizing,)
+        entry = self.position_cache.get(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = restore_cell(entry[2], symmetry, self.size)
+            if entry[3] >= draft:
+                score = _uncache_score(entry[0], depth)
+                if entry[1] == EXACT:
+                    return score
+                elif entry[1] == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
                     beta = min(beta, score)
-                    if beta <= alpha:
-                        break
-            return min_score
+                if beta <= alpha:
+                    return score
 
-    def evaluate_board(self):
-        winning_combos = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
-            [0, 4, 8], [2, 4, 6]  # diagonals
-        ]
+        if blocks:
+            # every other move loses at once, so the block is the only move worth searching
+            moves = [blocks.bit_length() - 1]
+        else:
+            moves = self._ordered_moves(own_bits, opponent_bits, depth, tt_move)
 
-        for combo in winning_combos:
-            if self.board[combo[0]] == self.board[combo[1]] == self.board[combo[2]] != ' ':
-                return self.board[combo[0]]
+        window_alpha, window_beta = alpha, beta
+        best_move = None
 
-        return None
+        if is_maximizing:
+            best_score = -math.inf
+            for i in moves:
+                bit = 1 << i
+                if best_move is None:
+                    score = self._minimax(ai_bits | bit, human_bits, depth + 1, False, alpha, beta)
+                else:
+                    score = self._minimax(ai_bits | bit, human_bits, depth + 1, False, alpha, alpha + 1)
+                    if alpha < score < beta:
+                        score = self._minimax(ai_bits | bit, human_bits, depth + 1, False, alpha, beta)
+                if score > best_score:
+                    best_score = score
+                    best_move = i
+                alpha = max(alpha, score)
+                if beta <= alpha:
+                    self._record_cutoff(i, depth, draft)
+                    break
+        else:
+            best_score = math.inf
+            for i in moves:
+                bit = 1 << i
+                if best_move is None:
+                    score = self._minimax(ai_bits, human_bits | bit, depth + 1, True, alpha, beta)
+                else:
+                    score = self._minimax(ai_bits, human_bits | bit, depth + 1, True, beta - 1, beta)
+                    if alpha < score < beta:
+                        score = self._minimax(ai_bits, human_bits | bit, depth + 1, True, alpha, beta)
+                if score < best_score:
+                    best_score = score
+                    best_move = i
+                beta = min(beta, score)
+                if beta <= alpha:
+                    self._record_cutoff(i, depth, draft)
+                    break
+
+        if best_score <= window_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= window_beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.position_cache.put(key, (_cache_score(best_score, depth), flag,
+                                      transform_cell(best_move, symmetry, self.size), draft))
+        return best_score
+
+    def _threats(self, own_bits, opponent_bits):
+        # empty cells that would complete one of own lines
+        cells = 0
+        for mask in self.line_masks:
+            if not opponent_bits & mask:
+                own_line = own_bits & mask
+                if own_line.bit_count() == self.k - 1:
+                    cells |= mask ^ own_line
+        return cells
+
+    def _ordered_moves(self, own_bits, opponent_bits, depth, tt_move):
+        # cached best move, wins, blocks, killer moves, then by history score;
+        # the stable sort keeps the static centre-corner-edge order among equals.
+        # The priorities go in one shared array: the sort finishes before any child search reuses it
+        occupied = own_bits | opponent_bits
+        wins = self._threats(own_bits, opponent_bits)
+        blocks = self._threats(opponent_bits, own_bits)
+        killers = self._killers[depth + 1]
+        history = self._history
+        priority = self._move_priority
+
+        moves = []
+        for cell in self.move_order:
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            if cell == tt_move:
+                priority[cell] = -4 * MOVE_TIER
+            elif wins & bit:
+                priority[cell] = -3 * MOVE_TIER
+            elif blocks & bit:
+                priority[cell] = -2 * MOVE_TIER
+            elif cell == killers[0] or cell == killers[1]:
+                priority[cell] = -MOVE_TIER
+            else:
+                priority[cell] = -min(history[cell], MOVE_TIER - 1)
+            moves.append(cell)
+
+        moves.sort(key=priority.__getitem__)
+        return moves
+
+    def _record_cutoff(self, move, depth, draft):
+        killers = self._killers[depth + 1]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self._history[move] += draft * draft
+
+    def _principal_variation(self, ai_bits, human_bits, best_move):
+        # follow the cached best moves from the root; the line ends where the cache runs out
+        line = [best_move]
+        ai_bits |= 1 << best_move
+        is_maximizing = False
+        while not (_has_line(ai_bits, self.line_masks) or _has_line(human_bits, self.line_masks)
+                   or ai_bits | human_bits == self.full_mask):
+            own_bits, opponent_bits = (ai_bits, human_bits) if is_maximizing else (human_bits, ai_bits)
+            key, symmetry = canonicalize(ai_bits, human_bits, self.size)
+            entry = self.position_cache.peek(key + (is_maximizing,))
+            if entry is not None:
+                move = restore_cell(entry[2], symmetry, self.size)
+            else:
+                wins = self._threats(own_bits, opponent_bits)
+                if not wins:
+                    break
+                move = (wins & -wins).bit_length() - 1
+
+            line.append(move)
+            if is_maximizing:
+                ai_bits |= 1 << move
+            else:
+                human_bits |= 1 << move
+            is_maximizing = not is_maximizing
+        return line
+
+    def _heuristic(self, ai_bits, human_bits):
+        # open lines count in the owner's favour, weighted by how many stones they already hold
+        score = 0
+        for mask in self.line_masks:
+            ai_line = ai_bits & mask
+            human_line = human_bits & mask
+            if ai_line and not human_line:
+                score += self.line_weights[ai_line.bit_count()]
+            elif human_line and not ai_line:
+                score -= self.line_weights[human_line.bit_count()]
+        return score
+
+    def _noisy_heuristic(self, ai_bits, human_bits):
+        # the same position always gets the same noise at a level, so the search stays consistent
+        # and the level's cache carries over between games
+        mixed = (ai_bits * 0x9E3779B97F4A7C15 ^ human_bits * 0xC2B2AE3D27D4EB4F ^ self.strength) & _MASK64
+        mixed = (mixed ^ mixed >> 31) * 0xBF58476D1CE4E5B9 & _MASK64
+        noise = self._noise
+        return type(self)._heuristic(self, ai_bits, human_bits) + (mixed >> 11) % (2 * noise + 1) - noise
+
+    def evaluate_board(self):
+        return self.winner
+
+    def evaluate_boards(self, boards):
+        return evaluate_boards(boards, self.size, self.k)
 
     def check_game_end(self):
-        winner = self.evaluate_board()
+        winner = self.winner
 
         if winner:
             self.game_over = True
@@ -120,7 +876,7 @@ class GameLogic:
             else:
                 self.stats['AI'] += 1
                 return 'ai_win'
-        elif ' ' not in self.board:
+        elif self._occupied() == self.full_mask:
             self.game_over = True
             self.stats['Tie'] += 1
             return 'tie'
@@ -128,25 +884,300 @@ class GameLogic:
         return 'continue'
 
     def get_winning_line(self):
-        winning_combos = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],
-            [0, 4, 8], [2, 4, 6]
-        ]
-
-        winner = self.evaluate_board()
-        if winner:
-            for combo in winning_combos:
-                if self.board[combo[0]] == self.board[combo[1]] == self.board[combo[2]] == winner:
-                    return combo
+        if self.winning_line is None:
+            return None
 
-        return None
+        cells = []
+        mask = self.line_masks[self.winning_line]
+        while mask:
+            lowest = mask & -mask
+            cells.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return cells
 
     def set_difficulty(self, difficulty):
-        if difficulty in ['Easy', 'Medium', 'Hard']:
+        if difficulty in DIFFICULTY_STRENGTH:
             self.ai_difficulty = difficulty
+            self.strength = DIFFICULTY_STRENGTH[difficulty]
+
+    def set_strength(self, strength):
+        # 0-100; ai_difficulty follows as the nearest named level, which is what game logs record
+        self.strength = max(0, min(MAX_STRENGTH, int(strength)))
+        self.ai_difficulty = min(DIFFICULTY_STRENGTH, key=lambda name: abs(DIFFICULTY_STRENGTH[name] - self.strength))
 
     def get_formatted_stats(self):
         return (f"YOU: {self.stats['Human']}    "
                 f"AI: {self.stats['AI']}    "
                 f"TIES: {self.stats['Tie']}")
+
+
+def strength_profile(strength):
+    # (depth limit, heuristic noise, node budget, blunder chance) for a strength below the maximum
+    weakness = MAX_STRENGTH - strength
+    depth = 1 + strength // 12
+    noise = STRENGTH_NOISE * weakness // MAX_STRENGTH
+    node_budget = int(STRENGTH_NODES * 2 ** (strength / 10))
+    blunder_chance = max(0.0, 0.9 * (60 - strength) / 60)
+    return depth, noise, node_budget, blunder_chance
+
+
+_MASK64 = (1 << 64) - 1
+
+
+@functools.lru_cache(maxsize=None)
+def cell_lines(size=3, k=3):
+    masks = line_masks(size, k)
+    return tuple(tuple(line for line, mask in enumerate(masks) if mask >> cell & 1)
+                 for cell in range(size * size))
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_keys(cells=9):
+    # fixed seed: the same position hashes the same in every process and run
+    rng = random.Random(cells)
+    return tuple(tuple(rng.getrandbits(64) for _ in range(cells)) for _ in range(2))
+
+
+@functools.lru_cache(maxsize=None)
+def move_order(size=3, k=3):
+    # cells on more lines first (centre, corners, edges on the 3x3 board), nearer the centre on ties
+    lines_through = [0] * (size * size)
+    for mask in line_masks(size, k):
+        for cell in range(size * size):
+            if mask >> cell & 1:
+                lines_through[cell] += 1
+
+    def priority(cell):
+        row, col = divmod(cell, size)
+        centre = (size - 1) / 2
+        return -lines_through[cell], (row - centre) ** 2 + (col - centre) ** 2
+
+    return tuple(sorted(range(size * size), key=priority))
+
+
+@functools.lru_cache(maxsize=None)
+def board_symmetries(size=3):
+    last = size - 1
+    maps = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    )
+    symmetries = []
+    for mapping in maps:
+        image = [0] * (size * size)
+        for cell in range(size * size):
+            r, c = mapping(*divmod(cell, size))
+            image[cell] = r * size + c
+        symmetries.append(tuple(image))
+    return tuple(symmetries)
+
+
+@functools.lru_cache(maxsize=None)
+def _inverse_symmetries(size=3):
+    inverses = []
+    for image in board_symmetries(size):
+        inverse = [0] * len(image)
+        for cell, target in enumerate(image):
+            inverse[target] = cell
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
+
+
+@functools.lru_cache(maxsize=None)
+def _chunk_tables(size=3):
+    # per symmetry and 8-cell chunk: chunk bit pattern -> transformed bits, so a board maps in
+    # size * size / 8 lookups and the tables grow with the cell count, not 2 ** size
+    cells = size * size
+    tables = []
+    for image in board_symmetries(size):
+        chunks = []
+        for first in range(0, cells, 8):
+            targets = [1 << image[cell] for cell in range(first, min(first + 8, cells))]
+            targets += [0] * (8 - len(targets))
+            patterns = [0]
+            for target in targets:
+                patterns += [bits | target for bits in patterns]
+            chunks.append(tuple(patterns))
+        tables.append(tuple(chunks))
+    return tuple(tables)
+
+
+def transform_bits(bits, symmetry, size=3):
+    transformed = 0
+    for patterns in _chunk_tables(size)[symmetry]:
+        transformed |= patterns[bits & 0xFF]
+        bits >>= 8
+    return transformed
+
+
+def transform_cell(cell, symmetry, size=3):
+    return board_symmetries(size)[symmetry][cell]
+
+
+def restore_cell(cell, symmetry, size=3):
+    return _inverse_symmetries(size)[symmetry][cell]
+
+
+def canonicalize(own_bits, opponent_bits, size=3):
+    best_key = (own_bits, opponent_bits)
+    best_symmetry = 0
+    for symmetry in range(1, 8):
+        key = (transform_bits(own_bits, symmetry, size), transform_bits(opponent_bits, symmetry, size))
+        if key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+
+def _cache_score(score, depth):
+    # store win/loss scores relative to the node so entries are reusable at any depth
+    if score >= WIN_THRESHOLD:
+        return score + depth
+    elif score <= -WIN_THRESHOLD:
+        return score - depth
+    return score
+
+
+def _uncache_score(score, depth):
+    if score >= WIN_THRESHOLD:
+        return score - depth
+    elif score <= -WIN_THRESHOLD:
+        return score + depth
+    return score
+
+
+BATCH_EMPTY, BATCH_X, BATCH_O = 0, 1, -1
+BATCH_CHUNK_ROWS = 1 << 20
+
+
+@functools.lru_cache(maxsize=None)
+def _line_matrix(size=3, k=3):
+    import numpy as np
+
+    masks = line_masks(size, k)
+    # float32 so the product goes through BLAS; small integer sums are exact
+    matrix = np.zeros((size * size, len(masks)), dtype=np.float32)
+    for line, mask in enumerate(masks):
+        for cell in range(size * size):
+            if mask >> cell & 1:
+                matrix[cell, line] = 1
+    matrix.flags.writeable = False
+    return matrix
+
+
+def evaluate_boards(boards, size=3, k=None):
+    # boards: (M, size*size) int8 array of BATCH_EMPTY / BATCH_X / BATCH_O
+    # returns (winners, terminal, legal): winner per board as BATCH_X / BATCH_O / BATCH_EMPTY,
+    # whether the game is over, and an (M, size*size) mask of the moves still allowed
+    import numpy as np
+
+    if k is None:
+        k = size
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim != 2 or boards.shape[1] != size * size:
+        raise ValueError(f"expected an (M, {size * size}) array of boards, got shape {boards.shape}")
+
+    matrix = _line_matrix(size, k)
+    x_wins = np.empty(len(boards), dtype=bool)
+    o_wins = np.empty(len(boards), dtype=bool)
+    # one matmul per chunk sums every line of every board: +k is a full X line, -k a full O line
+    for start in range(0, len(boards), BATCH_CHUNK_ROWS):
+        chunk = slice(start, start + BATCH_CHUNK_ROWS)
+        line_sums = boards[chunk].astype(np.float32) @ matrix
+        x_wins[chunk] = (line_sums == k).any(axis=1)
+        o_wins[chunk] = (line_sums == -k).any(axis=1)
+    winners = np.where(x_wins, BATCH_X, np.where(o_wins, BATCH_O, BATCH_EMPTY)).astype(np.int8)
+
+    empty = boards == BATCH_EMPTY
+    terminal = x_wins | o_wins | ~empty.any(axis=1)
+    legal = empty & ~terminal[:, None]
+    return winners, terminal, legal
+
+
+def solved_position(own_bits, opponent_bits):
+    key, symmetry = canonicalize(own_bits, opponent_bits)
+    entry = _SOLVED_TABLE.get(key)
+    if entry is None:
+        with _SOLVED_LOCK:
+            if not _SOLVED_TABLE:
+                _solve(0, 0)
+            entry = _SOLVED_TABLE.get(key) or _solve(*key)
+
+    score, moves = entry
+    return score, tuple(sorted(restore_cell(move, symmetry) for move in moves))
+
+
+def solved_move_scores(own_bits, opponent_bits):
+    # ((move, exact score), ...) for every empty cell, scored like _solve does
+    key = (own_bits, opponent_bits)
+    scores = _MOVE_SCORES.get(key)
+    if scores is None:
+        scores = _MOVE_SCORES[key] = tuple(_move_scores(own_bits, opponent_bits))
+    return scores
+
+
+def _move_scores(own_bits, opponent_bits):
+    occupied = own_bits | opponent_bits
+    for i in range(9):
+        bit = 1 << i
+        if occupied & bit:
+            continue
+
+        own_after = own_bits | bit
+        if _has_line(own_after):
+            score = WIN_SCORE
+        elif occupied | bit == FULL_MASK:
+            score = 0
+        else:
+            score = -solved_position(opponent_bits, own_after)[0]
+            score += (score < 0) - (score > 0)
+        yield i, score
+
+
+def _solve(own_bits, opponent_bits):
+    key, symmetry = canonicalize(own_bits, opponent_bits)
+    entry = _SOLVED_TABLE.get(key)
+    if entry is not None:
+        return entry
+    own_bits, opponent_bits = key
+
+    occupied = own_bits | opponent_bits
+    best_score = -math.inf
+    best_moves = []
+    for i in range(9):
+        bit = 1 << i
+        if occupied & bit:
+            continue
+
+        own_after = own_bits | bit
+        if _has_line(own_after):
+            score = WIN_SCORE
+        elif occupied | bit == FULL_MASK:
+            score = 0
+        else:
+            # one ply further from the result: shrink the reply's score towards zero
+            score = -_solve(opponent_bits, own_after)[0]
+            score += (score < 0) - (score > 0)
+
+        if score > best_score:
+            best_score = score
+            best_moves = [i]
+        elif score == best_score:
+            best_moves.append(i)
+
+    entry = (best_score, tuple(best_moves))
+    _SOLVED_TABLE[key] = entry
+    return entry
+
+
+def _has_line(bits, masks=WIN_MASKS):
+    for mask in masks:
+        if bits & mask == mask:
+            return True
+    return False
@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.request_ids = itertools.count(1)
+        self.listener = asyncio.create_task(self.listen())
+
+    async def listen(self):
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            self.pending.pop(response['id']).set_result(response)
+
+    async def request(self, **message):
+        message['id'] = next(self.request_ids)
+        future = self.pending[message['id']] = asyncio.get_running_loop().create_future()
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        response = await future
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    async def close(self):
+        self.writer.close()
+        self.listener.cancel()
+
+
+async def play(connection, rng, deadline, latencies, options):
+    session = (await connection.request(op='new', size=options.size, k=options.k,
+                                        difficulty=options.difficulty))['session']
+    board = '.' * options.size ** 2
+    while time.perf_counter() < deadline:
+        move = rng.choice([cell for cell, mark in enumerate(board) if mark == '.'])
+        started = time.perf_counter()
+        response = await connection.request(op='move', session=session, position=move)
+        latencies.append(time.perf_counter() - started)
+
+        board = response['board']
+        if response['result'] != 'continue':
+            board = (await connection.request(op='reset', session=session))['board']
+    await connection.request(op='close', session=session)
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(options):
+    per_connection = -(-options.sessions // options.connections)
+    connections = []
+    for _ in range(options.connections):
+        reader, writer = await asyncio.open_connection(options.host, options.port, limit=1 << 16)
+        connections.append(Connection(reader, writer))
+
+    rng = random.Random(options.seed)
+    latencies = []
+    started = time.perf_counter()
+    deadline = started + options.duration
+    players = [play(connections[index // per_connection], random.Random(rng.random()), deadline,
+                    latencies, options)
+               for index in range(options.sessions)]
+    await asyncio.gather(*players)
+    elapsed = time.perf_counter() - started
+
+    for connection in connections:
+        await connection.close()
+
+    latencies.sort()
+    return {
+        'sessions': options.sessions,
+        'moves': len(latencies),
+        'seconds': elapsed,
+        'moves_per_sec': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'p999_ms': percentile(latencies, 0.999) * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+def wait_for_server(process):
+    line = process.stdout.readline()
+    if not line.startswith('serving'):
+        raise RuntimeError(f"server failed to start: {line!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for server.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=10_000, help="concurrent game sessions")
+    parser.add_argument('--connections', type=int, default=100, help="TCP connections the sessions share")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to keep playing")
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--k', type=int, default=None)
+    parser.add_argument('--difficulty', choices=['Easy', 'Medium', 'Hard'], default='Hard')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--spawn-server', action='store_true', help="start server.py for the duration of the run")
+    parser.add_argument('--json', action='store_true', help="print the result as JSON")
+    options = parser.parse_args(argv)
+    options.k = options.k or options.size
+
+    server = None
+    if options.spawn_server:
+        server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+        server = subprocess.Popen([sys.executable, server_path, '--host', options.host, '--port', str(options.port)],
+                                  stdout=subprocess.PIPE, text=True)
+        wait_for_server(server)
+    try:
+        result = asyncio.run(run_load(options))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if options.json:
+        print(json.dumps(result))
+    else:
+        print(f"{result['moves']} moves over {result['sessions']} sessions in {result['seconds']:.1f}s: "
+              f"{result['moves_per_sec']:.0f} moves/s, p50 {result['p50_ms']:.2f} ms, "
+              f"p99 {result['p99_ms']:.2f} ms, p99.9 {result['p999_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
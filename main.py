@@ -1,31 +1,79 @@
-import tkinter as tk
+import argparse
+import sys
+import time
+from game_controller import DEFAULT_LOG_PATH, GameController
+from game_log import MAX_MOVES
 from game_logic import GameLogic
-from ui_components import UIComponents
+from scheduler import Scheduler
+
+
+class StartupProfile:
+    # phase timings in the layout of -X importtime, printed to stderr once startup has finished
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - self.started))
+        self.last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("startup: self [us] | cumulative | phase", file=sys.stderr)
+        for phase, own, total in self.phases:
+            print(f"startup: {own * 1e6:9.0f} | {total * 1e6:10.0f} | {phase}", file=sys.stderr)
 
 
 class TicTacToeAI:
-    def __init__(self):
+    def __init__(self, size=3, k=None, show_search_stats=False, log_path=DEFAULT_LOG_PATH, book_path=None,
+                 profile=None, strategy='minimax', profile_timers=False, rng=None):
+        self.profile = profile or StartupProfile()
+        # tkinter costs more to import than the whole engine, so only the GUI pays for it
+        import tkinter as tk
+        from ui_components import UIComponents
+        self.profile.mark("import tkinter")
+
         self.root = tk.Tk()
         self.root.title("Tic-Tac-Toe vs AI")
         self.root.geometry("600x800")
         self.root.configure(bg='#0f1419')
         self.root.resizable(False, False)
-
-        self.game_logic = GameLogic()
+        # every recurring after() chain goes through here so new_game and quit can cancel it
+        self.scheduler = Scheduler(self.root, profile_timers)
+
+        self.game_logic = GameLogic(size, k, rng=rng)
+        if show_search_stats:
+            self.game_logic.enable_search_stats()
+        self.log_path = log_path if self.game_logic.cells <= MAX_MOVES else None
+        self.game_logic.set_strategy(strategy)
+        if book_path:
+            self.game_logic.load_book(book_path)
+        self.controller = GameController(self.game_logic, self, self.scheduler.after,
+                                         cancel=self.scheduler.cancel)
         self.ui_components = UIComponents()
 
         self.thinking_animation = False
-        self.buttons = []
+        self.title_timer = None
+        self.thinking_timer = None
+        self.board_view = None
         self.status_label = None
         self.thinking_dots = None
         self.stats_label = None
+        self.search_stats_label = None
         self.title_label = None
-        self.difficulty_var = tk.StringVar(value=self.game_logic.ai_difficulty)
+        self.difficulty_var = tk.IntVar(value=self.game_logic.strength)
+        self.profile.mark("create window")
 
         self.setup_ui()
-        self.animate_title()
+        self.profile.mark("build widgets")
 
     def setup_ui(self):
+        import tkinter as tk
+
         main_container = tk.Frame(self.root, bg=self.ui_components.colors['bg_primary'])
         main_container.pack(fill='both', expand=True, padx=30, pady=20)
 
@@ -37,21 +85,31 @@ class TicTacToeAI:
             self.change_difficulty
         )
 
-        board_container, self.buttons = self.ui_components.create_game_board(
+        board_container, self.board_view = self.ui_components.create_game_board(
             main_container,
-            self.make_move
+            self.controller.human_move,
+            self.game_logic.size
         )
 
         status_frame, self.status_label, self.thinking_dots = self.ui_components.create_status_section(
             main_container
         )
+        if self.game_logic.search_stats is not None:
+            self.search_stats_label = self.ui_components.create_search_stats_label(status_frame)
+
+        history_frame = self.ui_components.create_history_buttons(
+            main_container,
+            self.controller.undo,
+            self.controller.redo
+        )
 
         button_frame = self.ui_components.create_control_buttons(
             main_container,
-            self.new_game,
-            self.reset_stats,
-            self.root.quit
+            self.controller.new_game,
+            self.controller.reset_stats,
+            self.quit
         )
+        self.root.protocol('WM_DELETE_WINDOW', self.quit)
 
     def animate_title(self):
         colors = [
@@ -65,132 +123,96 @@ class TicTacToeAI:
             current_color = colors[0]
             colors.append(colors.pop(0))
             self.title_label.config(fg=current_color)
-            self.root.after(2000, cycle_colors)
+            self.title_timer = self.scheduler.after(2000, cycle_colors)
 
         cycle_colors()
 
     def animate_thinking(self):
-        if not self.thinking_animation:
+        if not self.thinking_animation or self.thinking_timer is not None:
             return
 
         dots = ["●", "●●", "●●●", "●●●●", "●●●", "●●", "●"]
 
         def update_dots():
-            if not self.thinking_animation:
-                self.thinking_dots.config(text="")
-                return
-
             current_dots = dots[0]
             dots.append(dots.pop(0))
             self.thinking_dots.config(text=f"AI thinking {current_dots}")
-            self.root.after(200, update_dots)
+            self.thinking_timer = self.scheduler.after(200, update_dots)
 
         update_dots()
 
-    def change_difficulty(self, event):
-        difficulty = self.difficulty_var.get()
-        self.game_logic.set_difficulty(difficulty)
+    def change_difficulty(self, value):
+        self.controller.set_strength(int(float(value)))
 
-    def make_move(self, position):
-        if not self.game_logic.make_move(position, self.game_logic.human):
-            return
+    def render_board(self, board, human, winning_line):
+        # the view redraws only the cells whose mark or highlight changed
+        self.board_view.render(board, human, winning_line)
 
-        self.ui_components.update_button(
-            self.buttons[position],
-            self.game_logic.human,
-            'human'
-        )
+    def show_status(self, message, status_type):
+        self.ui_components.update_status(self.status_label, message, status_type)
 
-        game_result = self.game_logic.check_game_end()
-        if game_result != 'continue':
-            self.handle_game_end(game_result)
+    def show_thinking(self, active):
+        self.thinking_animation = active
+        if active:
+            self.animate_thinking()
             return
+        if self.thinking_timer is not None:
+            self.scheduler.cancel(self.thinking_timer)
+            self.thinking_timer = None
+        self.thinking_dots.config(text="")
 
-        self.ui_components.update_status(
-            self.status_label,
-            "AI is analyzing the board...",
-            'ai_thinking'
-        )
-
-        self.thinking_animation = True
-        self.animate_thinking()
-        self.root.update()
-
-        self.root.after(800, self.execute_ai_move)
+    def show_stats(self, text):
+        self.stats_label.config(text=text)
 
-    def execute_ai_move(self):
-        ai_move = self.game_logic.get_ai_move()
-        self.thinking_animation = False
+    def show_search_stats(self, summary):
+        if self.search_stats_label is not None:
+            self.search_stats_label.config(text=summary)
 
-        if ai_move is not None:
-            self.game_logic.make_move(ai_move, self.game_logic.ai)
-            self.ui_components.update_button(
-                self.buttons[ai_move],
-                self.game_logic.ai,
-                'ai'
-            )
-
-        game_result = self.game_logic.check_game_end()
-        self.handle_game_end(game_result)
-
-    def handle_game_end(self, game_result):
-        if game_result == 'human_win':
-            self.ui_components.update_status(
-                self.status_label,
-                "VICTORY! You defeated the AI!",
-                'human_win'
-            )
-            self.highlight_winning_line()
-
-        elif game_result == 'ai_win':
-            self.ui_components.update_status(
-                self.status_label,
-                "AI WINS! Better luck next time!",
-                'ai_win'
-            )
-            self.highlight_winning_line()
-
-        elif game_result == 'tie':
-            self.ui_components.update_status(
-                self.status_label,
-                " IT'S A TIE! Great game! ",
-                'tie'
-            )
-
-        elif game_result == 'continue':
-            self.ui_components.update_status(
-                self.status_label,
-                "Your turn! Make your move",
-                'player_turn'
-            )
-        self.stats_label.config(text=self.game_logic.get_formatted_stats())
-
-    def highlight_winning_line(self):
-        winning_line = self.game_logic.get_winning_line()
-        if winning_line:
-            self.ui_components.highlight_winning_buttons(self.buttons, winning_line)
-
-    def new_game(self):
-        self.game_logic.reset_board()
-        self.thinking_animation = False
+    def quit(self):
+        self.controller.close()
+        self.scheduler.cancel_all()
+        self.title_timer = self.thinking_timer = None
+        self.root.quit()
 
-        self.ui_components.reset_buttons(self.buttons)
-        self.ui_components.update_status(
-            self.status_label,
-            "Your turn! Make your move",
-            'player_turn'
-        )
-        self.thinking_dots.config(text="")
+    def first_frame(self):
+        self.root.update_idletasks()
+        self.profile.mark("first frame")
+        # nothing below is needed to draw the board, so it waits until the window is on screen
+        self.scheduler.after(0, self.finish_startup)
 
-    def reset_stats(self):
-        self.game_logic.reset_stats()
-        self.stats_label.config(text=self.game_logic.get_formatted_stats())
+    def finish_startup(self):
+        self.animate_title()
+        if self.log_path:
+            self.controller.open_log(self.log_path)
+        self.profile.mark("deferred startup work")
+        self.profile.report()
 
     def run(self):
+        self.root.after_idle(self.first_frame)
         self.root.mainloop()
 
 
 if __name__ == "__main__":
-    game = TicTacToeAI()
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe vs AI")
+    parser.add_argument('--size', type=int, default=3, help="board is SIZE x SIZE cells")
+    parser.add_argument('--k', type=int, default=None, help="marks in a row needed to win (default: SIZE)")
+    parser.add_argument('--search-stats', action='store_true', help="show search statistics after each AI move")
+    parser.add_argument('--log', default=DEFAULT_LOG_PATH, help="game log to read stats from and append games to")
+    parser.add_argument('--book', help="opening book / tablebase file built with book.py")
+    parser.add_argument('--no-log', dest='log', action='store_const', const=None, help="do not record games")
+    parser.add_argument('--strategy', choices=['minimax', 'mcts'], default='minimax',
+                        help="mcts plays to a per-difficulty budget and suits boards minimax cannot finish")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print import, window and time-to-first-frame timings to stderr")
+    parser.add_argument('--profile-timers', action='store_true',
+                        help="print per-callback duration and event-loop lag of after() timers on exit")
+    args = parser.parse_args()
+    profile = StartupProfile(args.startup_profile)
+    profile.mark("parse arguments")
+
+    game = TicTacToeAI(args.size, args.k, args.search_stats, args.log, args.book, profile, args.strategy,
+                       args.profile_timers)
 
     game.run()
+    if args.profile_timers:
+        game.scheduler.report(sys.stderr)
@@ -0,0 +1,211 @@
+import functools
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic import cell_lines, line_masks
+
+EXPLORATION = math.sqrt(2)
+# playouts per move at strength 0, doubling every 10 strength points (20_000 at 100);
+# every level is also capped by the game's time_limit
+STRENGTH_ITERATIONS = 20
+WIN, DRAW, LOSS = 1.0, 0.5, 0.0
+
+
+@functools.lru_cache(maxsize=None)
+def cell_masks(size=3, k=3):
+    # the winning-line masks through each cell, so a move is checked only against its own lines
+    masks = line_masks(size, k)
+    return tuple(tuple(masks[line] for line in lines) for lines in cell_lines(size, k))
+
+
+def free_cells(own_bits, opponent_bits, cells):
+    occupied = own_bits | opponent_bits
+    return [cell for cell in range(cells) if not occupied >> cell & 1]
+
+
+class Node:
+    # value is from the point of view of the player whose move led here
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'value', 'terminal')
+
+    def __init__(self, move, parent, untried, terminal=None):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.value = 0.0
+        self.terminal = terminal
+
+
+def iterate(root, own_bits, opponent_bits, masks, exploration, rng):
+    # one select / expand / playout / backpropagate pass from a root with `own` to move
+    node = root
+    bits = [own_bits, opponent_bits]
+    mover = 0
+
+    while not node.untried and node.children:
+        log_visits = math.log(node.visits)
+        node = max(node.children, key=lambda child: child.value / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+        bits[mover] |= 1 << node.move
+        mover ^= 1
+
+    if node.untried:
+        index = rng.randrange(len(node.untried))
+        untried = node.untried
+        untried[index], untried[-1] = untried[-1], untried[index]
+        move = untried.pop()
+        bits[mover] |= 1 << move
+        remaining = untried + [child.move for child in node.children]
+        if any(bits[mover] & mask == mask for mask in masks[move]):
+            child = Node(move, node, [], WIN)
+        elif not remaining:
+            child = Node(move, node, [], DRAW)
+        else:
+            child = Node(move, node, remaining)
+        node.children.append(child)
+        node = child
+        mover ^= 1
+
+    if node.terminal is not None:
+        value = node.terminal
+    else:
+        value = playout(bits, mover, list(node.untried), masks, rng)
+
+    while node is not None:
+        node.visits += 1
+        node.value += value
+        value = 1.0 - value
+        node = node.parent
+
+
+def playout(bits, mover, free, masks, rng):
+    # random game to the end; scored for the player who moved last before it started
+    rng.shuffle(free)
+    own = bits[mover]
+    other = bits[mover ^ 1]
+    to_move_wins = True
+    for cell in free:
+        own |= 1 << cell
+        for mask in masks[cell]:
+            if own & mask == mask:
+                return LOSS if to_move_wins else WIN
+        own, other = other, own
+        to_move_wins = not to_move_wins
+    return DRAW
+
+
+def run(root, own_bits, opponent_bits, size, k, iterations, time_ms, exploration, rng, is_cancelled=None):
+    masks = cell_masks(size, k)
+    deadline = None if time_ms is None else time.perf_counter() + time_ms / 1000
+    done = 0
+    while iterations is None or done < iterations:
+        iterate(root, own_bits, opponent_bits, masks, exploration, rng)
+        done += 1
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if is_cancelled is not None and is_cancelled():
+            break
+    return done
+
+
+def root_statistics(size, k, own_bits, opponent_bits, iterations, time_ms, exploration, seed):
+    # one independent tree for root parallelism; only the root's children travel back
+    root = Node(None, None, free_cells(own_bits, opponent_bits, size * size))
+    run(root, own_bits, opponent_bits, size, k, iterations, time_ms, exploration, random.Random(seed))
+    return {child.move: (child.visits, child.value) for child in root.children}
+
+
+class MCTSStrategy:
+    name = 'mcts'
+
+    def __init__(self, iterations=None, time_ms=None, exploration=EXPLORATION, workers=1,
+                 reuse_tree=True, executor=None):
+        # leave iterations and time_ms unset to let the game's strength pick the budget
+        self.iterations = iterations
+        self.time_ms = time_ms
+        self.exploration = exploration
+        self.workers = workers
+        self.reuse_tree = reuse_tree
+        self.executor = executor
+        self._owns_executor = False
+        self.root = None
+        self.root_key = None
+        self.last_iterations = 0
+
+    def budget(self, game):
+        if self.iterations is not None or self.time_ms is not None:
+            return self.iterations, self.time_ms
+        time_ms = None if game.time_limit is None else game.time_limit * 1000
+        return int(STRENGTH_ITERATIONS * 2 ** (game.strength / 10)), time_ms
+
+    def choose_move(self, game, deadline=None):
+        ai_bits = game.bitboards[game.ai]
+        human_bits = game.bitboards[game.human]
+        iterations, time_ms = self.budget(game)
+        if deadline is not None:
+            # leave a little for picking the move and shipping results back from workers
+            remaining_ms = max(1.0, (deadline - time.perf_counter()) * 1000 * 0.9)
+            time_ms = remaining_ms if time_ms is None else min(time_ms, remaining_ms)
+
+        if self.workers > 1:
+            return self._choose_parallel(game, ai_bits, human_bits, iterations, time_ms)
+
+        root = self._reusable_root(game, ai_bits, human_bits)
+        try:
+            self.last_iterations = run(root, ai_bits, human_bits, game.size, game.k, iterations, time_ms,
+                                       self.exploration, game.rng, lambda: game.search_cancelled)
+        finally:
+            game.search_cancelled = False
+
+        best = max(root.children, key=lambda child: child.visits)
+        if self.reuse_tree:
+            best.parent = None
+            self.root = best
+            self.root_key = (game.size, game.k, ai_bits | 1 << best.move, human_bits)
+        return best.move
+
+    def _reusable_root(self, game, ai_bits, human_bits):
+        # the tree kept from the last move still holds the reply the human just made
+        if self.root is not None:
+            size, k, kept_ai, kept_human = self.root_key
+            new_stones = human_bits & ~kept_human
+            if (size, k, kept_ai) == (game.size, game.k, ai_bits) and kept_human | new_stones == human_bits \
+                    and new_stones.bit_count() == 1:
+                move = new_stones.bit_length() - 1
+                for child in self.root.children:
+                    if child.move == move and child.terminal is None:
+                        child.parent = None
+                        self.root = None
+                        return child
+        self.root = None
+        return Node(None, None, free_cells(ai_bits, human_bits, game.cells))
+
+    def _choose_parallel(self, game, ai_bits, human_bits, iterations, time_ms):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._owns_executor = True
+        share = None if iterations is None else max(1, iterations // self.workers)
+        futures = [self.executor.submit(root_statistics, game.size, game.k, ai_bits, human_bits, share, time_ms,
+                                        self.exploration, game.rng.getrandbits(64))
+                   for _ in range(self.workers)]
+
+        visits = {}
+        for future in futures:
+            for move, (count, _) in future.result().items():
+                visits[move] = visits.get(move, 0) + count
+        self.last_iterations = sum(visits.values())
+        self.root = None
+        return max(visits, key=visits.get)
+
+    def reset(self):
+        self.root = None
+        self.root_key = None
+
+    def close(self):
+        if self._owns_executor:
+            self.executor.shutdown()
+            self.executor = None
+            self._owns_executor = False
@@ -0,0 +1,110 @@
+import time
+
+# upper bounds (ms) of the histogram buckets; the last bucket takes everything slower
+HISTOGRAM_BOUNDS_MS = (1, 2, 4, 8, 16, 33, 66, 100)
+
+
+class TimerStats:
+    __slots__ = ('calls', 'cancelled', 'durations', 'lags')
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = 0
+        self.durations = []
+        self.lags = []
+
+
+class Scheduler:
+    # wraps root.after so every callback is tracked while it is pending and can be cancelled
+    # in one go; with profile=True each run also records its duration and how late it fired
+    def __init__(self, root, profile=False):
+        self.root = root
+        self.profile = profile
+        self.pending = {}
+        self.stats = {}
+
+    def after(self, delay_ms, callback, *args):
+        name = getattr(callback, '__qualname__', repr(callback)).replace('.<locals>', '')
+        due = time.perf_counter() + delay_ms / 1000
+        after_id = None
+
+        def fire():
+            self.pending.pop(after_id, None)
+            if not self.profile:
+                callback(*args)
+                return
+            started = time.perf_counter()
+            try:
+                callback(*args)
+            finally:
+                stats = self.timer_stats(name)
+                stats.calls += 1
+                stats.lags.append(max(0.0, started - due) * 1000)
+                stats.durations.append((time.perf_counter() - started) * 1000)
+
+        after_id = self.root.after(int(delay_ms), fire)
+        self.pending[after_id] = name
+        return after_id
+
+    def cancel(self, after_id):
+        name = self.pending.pop(after_id, None)
+        if name is None:
+            return False
+        self.root.after_cancel(after_id)
+        if self.profile:
+            self.timer_stats(name).cancelled += 1
+        return True
+
+    def cancel_all(self):
+        for after_id in list(self.pending):
+            self.cancel(after_id)
+
+    def timer_stats(self, name):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = TimerStats()
+        return stats
+
+    def report(self, out):
+        print(f"{'callback':<44} {'calls':>6} {'cancel':>6} {'mean ms':>8} {'max ms':>8} "
+              f"{'lag p50':>8} {'lag p99':>8}", file=out)
+        for name, stats in sorted(self.stats.items()):
+            if stats.calls:
+                lags = sorted(stats.lags)
+                print(f"{name:<44} {stats.calls:>6} {stats.cancelled:>6} "
+                      f"{sum(stats.durations) / stats.calls:>8.2f} {max(stats.durations):>8.2f} "
+                      f"{percentile(lags, 50):>8.2f} {percentile(lags, 99):>8.2f}", file=out)
+            else:
+                print(f"{name:<44} {0:>6} {stats.cancelled:>6}", file=out)
+        if self.pending:
+            print(f"{len(self.pending)} callbacks still pending: "
+                  f"{', '.join(sorted(set(self.pending.values())))}", file=out)
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, len(sorted_samples) * pct // 100)]
+
+
+def histogram(samples_ms, bounds=HISTOGRAM_BOUNDS_MS):
+    counts = [0] * (len(bounds) + 1)
+    for sample in samples_ms:
+        for bucket, bound in enumerate(bounds):
+            if sample < bound:
+                counts[bucket] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+def print_histogram(title, samples_ms, out, bounds=HISTOGRAM_BOUNDS_MS):
+    samples = sorted(samples_ms)
+    print(f"{title}: {len(samples)} samples, p50 {percentile(samples, 50):.2f} ms, "
+          f"p99 {percentile(samples, 99):.2f} ms, max {samples[-1] if samples else 0.0:.2f} ms", file=out)
+    counts = histogram(samples, bounds)
+    widest = max(counts) or 1
+    labels = [f"< {bound} ms" for bound in bounds] + [f">= {bounds[-1]} ms"]
+    for label, count in zip(labels, counts):
+        print(f"  {label:>9} {count:>7} {'#' * round(40 * count / widest)}", file=out)
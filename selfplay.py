@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic import GameLogic
+
+OPPONENTS = ('random', 'Easy', 'Medium', 'Hard')
+
+
+def play_game(game, opponent, opponent_rng):
+    # the opponent takes the human's seat and always moves first, as in the app
+    game.reset_board()
+    if opponent is not None:
+        opponent.reset_board()
+
+    while True:
+        if opponent is None:
+            move = opponent_rng.choice(game.get_available_moves())
+        else:
+            move = opponent.get_ai_move()
+            opponent.make_move(move, opponent.ai)
+        game.make_move(move, game.human)
+
+        result = game.check_game_end()
+        if result != 'continue':
+            return result
+
+        move = game.get_ai_move()
+        game.make_move(move, game.ai)
+        if opponent is not None:
+            opponent.make_move(move, opponent.human)
+
+        result = game.check_game_end()
+        if result != 'continue':
+            return result
+
+
+def run_batch(games, seed, size=3, k=None, difficulty='Hard', opponent='random', strategy='minimax',
+              strength=None):
+    rng = random.Random(seed)
+    game = GameLogic(size, k, rng=rng)
+    game.set_difficulty(difficulty)
+    if strength is not None:
+        game.set_strength(strength)
+    game.set_strategy(strategy)
+
+    rival = None
+    if opponent != 'random':
+        rival = GameLogic(size, k, rng=rng)
+        rival.human, rival.ai = game.ai, game.human
+        rival.set_difficulty(opponent)
+
+    for _ in range(games):
+        play_game(game, rival, rng)
+    return game.stats
+
+
+def run_selfplay(games, seed=0, size=3, k=None, difficulty='Hard', opponent='random',
+                 workers=None, batch_size=10_000, strategy='minimax', strength=None):
+    workers = workers or os.cpu_count() or 1
+    # a small run is still split so that every worker gets a share
+    batch_size = max(1, min(batch_size, -(-games // workers)))
+    batches = [min(batch_size, games - start) for start in range(0, games, batch_size)]
+    # string seeds hash deterministically, so each batch gets its own reproducible stream
+    seeds = [f"{seed}:{index}" for index in range(len(batches))]
+
+    stats = {'Human': 0, 'AI': 0, 'Tie': 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_batch, count, batch_seed, size, k, difficulty, opponent, strategy, strength)
+                   for count, batch_seed in zip(batches, seeds)]
+        for future in futures:
+            for outcome, count in future.result().items():
+                stats[outcome] += count
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless AI self-play")
+    parser.add_argument('--games', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--k', type=int, default=None)
+    parser.add_argument('--difficulty', choices=['Easy', 'Medium', 'Hard'], default='Hard')
+    parser.add_argument('--strength', type=int, default=None, help="0-100, overrides --difficulty")
+    parser.add_argument('--opponent', choices=OPPONENTS, default='random')
+    parser.add_argument('--strategy', choices=['minimax', 'mcts'], default='minimax')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--ai-win-band', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                        help="exit with status 1 if the AI win rate falls outside [MIN, MAX]")
+    parser.add_argument('--json', action='store_true', help="print the result as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    stats = run_selfplay(args.games, args.seed, args.size, args.k, args.difficulty,
+                         args.opponent, args.workers, args.batch_size, args.strategy, args.strength)
+    elapsed = time.perf_counter() - started
+    ai_win_rate = stats['AI'] / args.games if args.games else 0.0
+
+    if args.json:
+        print(json.dumps({'stats': stats, 'games': args.games, 'seconds': elapsed,
+                          'ai_win_rate': ai_win_rate}))
+    else:
+        print(f"YOU: {stats['Human']}    AI: {stats['AI']}    TIES: {stats['Tie']}")
+        print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.0f} games/s), "
+              f"AI win rate {ai_win_rate:.3f}")
+
+    if args.ai_win_band:
+        low, high = args.ai_win_band
+        if not low <= ai_win_rate <= high:
+            print(f"AI win rate {ai_win_rate:.3f} outside [{low}, {high}]", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
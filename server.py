@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic import DIFFICULTY_STRENGTH, MAX_STRENGTH, GameLogic
+
+# one scratch game per board shape and process; sessions only keep their move list
+_ENGINES = {}
+
+
+class Session:
+    __slots__ = ('size', 'k', 'strength', 'moves', 'stats', 'last_active', 'busy')
+
+    def __init__(self, size, k, strength):
+        self.size = size
+        self.k = k
+        self.strength = strength
+        self.moves = bytearray()  # cell indexes, human first, then alternating
+        self.stats = [0, 0, 0]  # human wins, AI wins, ties
+        self.last_active = time.monotonic()
+        self.busy = False
+
+
+def load_game(size, k, strength, moves):
+    game = _ENGINES.get((size, k))
+    if game is None:
+        game = _ENGINES[(size, k)] = GameLogic(size, k)
+
+    game.reset_board()
+    game.set_strength(strength)
+    for index, position in enumerate(moves):
+        game.push(position, game.human if index % 2 == 0 else game.ai)
+    # push() skips the end-of-game bookkeeping, so a finished position must be closed here
+    game.game_over = game.winner is not None or game._occupied() == game.full_mask
+    return game
+
+
+def search_move(size, k, strength, moves, time_limit):
+    game = load_game(size, k, strength, moves)
+    game.time_limit = time_limit
+    return game.get_ai_move(deadline_ms=time_limit * 1000)
+
+
+def board_text(game):
+    return ''.join('.' if mark == ' ' else mark for mark in game.board)
+
+
+class GameServer:
+    def __init__(self, executor=None, idle_timeout=300.0, time_limit=1.0):
+        self.executor = executor
+        self.idle_timeout = idle_timeout
+        self.time_limit = time_limit
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+
+    async def handle_client(self, reader, writer):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                # each request runs on its own, so a slow search never holds up the connection
+                task = asyncio.create_task(self.respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line, writer):
+        request = {}
+        try:
+            request = json.loads(line)
+            response = await self.dispatch(request)
+        except KeyError as error:
+            response = {'error': f"missing field {error}"}
+        except (ValueError, TypeError) as error:
+            response = {'error': str(error)}
+        response['id'] = request.get('id')
+        writer.write(json.dumps(response).encode() + b'\n')
+
+    async def dispatch(self, request):
+        op = request['op']
+        if op == 'new':
+            return self.new_session(request)
+
+        session_id = request['session']
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"unknown session {session_id}")
+        session.last_active = time.monotonic()
+        if session.busy:
+            raise ValueError("session is busy with another move")
+
+        if op == 'move':
+            return await self.play_move(session, int(request['position']))
+        elif op == 'reset':
+            session.moves.clear()
+            return {'board': '.' * session.size ** 2, 'result': 'continue'}
+        elif op == 'stats':
+            human, ai, tie = session.stats
+            return {'stats': {'Human': human, 'AI': ai, 'Tie': tie}}
+        elif op == 'close':
+            del self.sessions[session_id]
+            return {'closed': session_id}
+        raise ValueError(f"unknown op {op!r}")
+
+    def new_session(self, request):
+        size = int(request.get('size', 3))
+        k = int(request.get('k', size))
+        difficulty = request.get('difficulty', 'Hard')
+        if not 3 <= size <= 7 or not 1 <= k <= size or difficulty not in DIFFICULTY_STRENGTH:
+            raise ValueError("bad size, k or difficulty")
+        # a numeric strength (0-100) overrides the named difficulty
+        strength = int(request.get('strength', DIFFICULTY_STRENGTH[difficulty]))
+        if not 0 <= strength <= MAX_STRENGTH:
+            raise ValueError("bad strength")
+
+        session_id = f"s{next(self.session_ids)}"
+        self.sessions[session_id] = Session(size, k, strength)
+        return {'session': session_id, 'board': '.' * size * size, 'result': 'continue'}
+
+    async def play_move(self, session, position):
+        game = load_game(session.size, session.k, session.strength, session.moves)
+        if game.game_over:
+            raise ValueError("game is over, send reset to play again")
+        if not 0 <= position < game.cells or not game.make_move(position, game.human):
+            raise ValueError(f"illegal move {position}")
+        session.moves.append(position)
+
+        ai_move = None
+        result = self.finish(session, game)
+        if result == 'continue':
+            ai_move = await self.ai_move(session)
+            game = load_game(session.size, session.k, session.strength, session.moves)
+            game.push(ai_move, game.ai)
+            session.moves.append(ai_move)
+            result = self.finish(session, game)
+
+        return {'ai_move': ai_move, 'board': board_text(game), 'result': result,
+                'winning_line': game.get_winning_line()}
+
+    async def ai_move(self, session):
+        args = (session.size, session.k, session.strength, bytes(session.moves), self.time_limit)
+        if session.size == 3 and session.k == 3 or self.executor is None:
+            # every level is answered from the solved table in microseconds (the weaker ones add
+            # noise to its per-move scores); a round trip to a worker costs more
+            return search_move(*args)
+
+        session.busy = True
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, search_move, *args)
+        finally:
+            session.busy = False
+
+    def finish(self, session, game):
+        result = game.check_game_end()
+        if result == 'human_win':
+            session.stats[0] += 1
+        elif result == 'ai_win':
+            session.stats[1] += 1
+        elif result == 'tie':
+            session.stats[2] += 1
+        return result
+
+    async def evict_idle_sessions(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            cutoff = time.monotonic() - self.idle_timeout
+            for session_id, session in list(self.sessions.items()):
+                if session.last_active < cutoff and not session.busy:
+                    del self.sessions[session_id]
+
+
+async def serve(host='127.0.0.1', port=8765, workers=None, idle_timeout=300.0, time_limit=1.0):
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        server = GameServer(executor, idle_timeout, time_limit)
+        evictor = asyncio.create_task(server.evict_idle_sessions())
+        listener = await asyncio.start_server(server.handle_client, host, port, limit=1 << 16)
+        print(f"serving on {host}:{port}", flush=True)
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-session Tic-Tac-Toe server (JSON lines over TCP)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="processes for AI searches")
+    parser.add_argument('--idle-timeout', type=float, default=300.0, help="seconds before an idle session is dropped")
+    parser.add_argument('--time-limit', type=float, default=1.0, help="hard cap in seconds on each AI search on large boards")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.idle_timeout, args.time_limit))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
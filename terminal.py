@@ -0,0 +1,167 @@
+import argparse
+import sys
+import time
+
+from game_controller import AI_MOVE_BUDGET_MS, DEFAULT_LOG_PATH, GameController
+from game_log import MAX_MOVES
+from game_logic import GameLogic
+
+HELP = ("commands: CELL (1-N) to move, u undo, r redo, n new game, "
+        "d easy|medium|hard or d 0-100 strength, s stats, q quit")
+
+
+class TerminalView:
+    # prints to a text stream; the board is drawn once per command, not once per change
+    def __init__(self, size, out=sys.stdout, quiet=False):
+        self.size = size
+        self.out = out
+        self.quiet = quiet
+        self.board = None
+        self.winning_line = None
+        self.dirty = False
+        self.stats = ""
+
+    def render_board(self, board, human, winning_line):
+        if (board, winning_line) == (self.board, self.winning_line):
+            return
+        self.board = board
+        self.winning_line = winning_line
+        self.dirty = True
+
+    def show_status(self, message, status_type):
+        if status_type == 'ai_thinking':
+            return
+        if status_type != 'player_turn' or not self.quiet:
+            self.flush()
+            print(message.strip(), file=self.out)
+
+    def show_thinking(self, active):
+        pass
+
+    def show_stats(self, text):
+        self.stats = text
+
+    def show_search_stats(self, summary):
+        if not self.quiet:
+            print(summary, file=self.out)
+
+    def flush(self):
+        if not self.dirty or self.quiet:
+            return
+        self.dirty = False
+        width = len(str(self.size * self.size))
+        winning = set(self.winning_line or ())
+        rows = []
+        for row in range(self.size):
+            cells = []
+            for cell in range(row * self.size, (row + 1) * self.size):
+                mark = self.board[cell]
+                if mark == ' ':
+                    text = str(cell + 1)
+                elif cell in winning:
+                    text = mark + '*'
+                else:
+                    text = mark
+                cells.append(f" {text:>{width + 1}} ")
+            rows.append('|'.join(cells))
+        separator = '+'.join('-' * (width + 3) for _ in range(self.size))
+        print(('\n' + separator + '\n').join(rows), file=self.out)
+
+
+def run(controller, view, lines, interactive=False, timings=None):
+    # drives the controller from text commands; returns when input ends or on q
+    cells = controller.game_logic.cells
+    controller.refresh_board()
+    view.flush()
+    while True:
+        if interactive:
+            print("> ", end="", file=view.out, flush=True)
+        line = lines.readline()
+        if not line:
+            return
+        command = line.strip().lower()
+        if not command or command.startswith('#'):
+            continue
+
+        started = time.perf_counter()
+        if command.isdigit():
+            cell = int(command) - 1
+            if not 0 <= cell < cells or not controller.human_move(cell):
+                print(f"illegal move: {command}", file=view.out)
+        elif command == 'u':
+            controller.undo()
+        elif command == 'r':
+            controller.redo()
+        elif command == 'n':
+            controller.new_game()
+        elif command.startswith('d ') and command[2:].strip().capitalize() in ('Easy', 'Medium', 'Hard'):
+            controller.set_difficulty(command[2:].strip().capitalize())
+        elif command.startswith('d ') and command[2:].strip().isdigit():
+            controller.set_strength(int(command[2:]))
+        elif command == 's':
+            print(view.stats or controller.game_logic.get_formatted_stats(), file=view.out)
+        elif command == 'q':
+            return
+        else:
+            print(HELP, file=view.out)
+        if timings is not None:
+            timings.append((command, (time.perf_counter() - started) * 1000))
+        view.flush()
+
+
+def report_timings(timings, out=sys.stderr):
+    if not timings:
+        return
+    latencies = sorted(ms for _, ms in timings)
+    print(f"{len(latencies)} commands: mean {sum(latencies) / len(latencies):.2f} ms, "
+          f"p50 {latencies[len(latencies) // 2]:.2f} ms, "
+          f"p99 {latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]:.2f} ms, "
+          f"max {latencies[-1]:.2f} ms", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe vs AI in the terminal")
+    parser.add_argument('--size', type=int, default=3, help="board is SIZE x SIZE cells")
+    parser.add_argument('--k', type=int, default=None, help="marks in a row needed to win (default: SIZE)")
+    parser.add_argument('--difficulty', choices=['Easy', 'Medium', 'Hard'], default='Hard')
+    parser.add_argument('--strength', type=int, default=None, help="0-100, overrides --difficulty")
+    parser.add_argument('--strategy', choices=['minimax', 'mcts'], default='minimax')
+    parser.add_argument('--book', help="opening book / tablebase file built with book.py")
+    parser.add_argument('--budget-ms', type=float, default=AI_MOVE_BUDGET_MS, help="hard cap on each AI move")
+    parser.add_argument('--log', default=DEFAULT_LOG_PATH, help="game log to read stats from and append games to")
+    parser.add_argument('--no-log', dest='log', action='store_const', const=None, help="do not record games")
+    parser.add_argument('--quiet', action='store_true', help="print only results and errors, not boards")
+    parser.add_argument('--timing', action='store_true',
+                        help="print per-command latency (including the AI reply) to stderr at the end")
+    args = parser.parse_args(argv)
+
+    game_logic = GameLogic(args.size, args.k)
+    game_logic.set_difficulty(args.difficulty)
+    if args.strength is not None:
+        game_logic.set_strength(args.strength)
+    game_logic.set_strategy(args.strategy)
+    if args.book:
+        game_logic.load_book(args.book)
+
+    view = TerminalView(args.size, quiet=args.quiet)
+    controller = GameController(game_logic, view, move_budget_ms=args.budget_ms)
+    if args.log and game_logic.cells <= MAX_MOVES:
+        controller.open_log(args.log)
+
+    timings = [] if args.timing else None
+    interactive = sys.stdin.isatty()
+    if interactive:
+        print(HELP)
+    try:
+        run(controller, view, sys.stdin, interactive, timings)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        controller.close()
+    if timings is not None:
+        report_timings(timings)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
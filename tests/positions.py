@@ -0,0 +1,50 @@
+import functools
+
+from game_logic import FULL_MASK, WIN_MASKS, WIN_SCORE
+
+
+def has_line(bits, masks=WIN_MASKS):
+    return any(bits & mask == mask for mask in masks)
+
+
+@functools.lru_cache(maxsize=None)
+def negamax(own_bits, opponent_bits):
+    # plain negamax with no symmetry or pruning, scored like the solved table: a win now is
+    # WIN_SCORE and every ply further from the result moves the score one step towards zero
+    occupied = own_bits | opponent_bits
+    scores = {}
+    for cell in range(9):
+        bit = 1 << cell
+        if occupied & bit:
+            continue
+        if has_line(own_bits | bit):
+            score = WIN_SCORE
+        elif occupied | bit == FULL_MASK:
+            score = 0
+        else:
+            score = -max(negamax(opponent_bits, own_bits | bit).values())
+            score += (score < 0) - (score > 0)
+        scores[cell] = score
+    return scores
+
+
+def reachable_positions():
+    # every non-terminal 3x3 position as (side to move bits, opponent bits)
+    positions = set()
+
+    def visit(own_bits, opponent_bits):
+        if (own_bits, opponent_bits) in positions:
+            return
+        positions.add((own_bits, opponent_bits))
+        for cell in range(9):
+            bit = 1 << cell
+            if (own_bits | opponent_bits) & bit:
+                continue
+            if not has_line(own_bits | bit) and (own_bits | opponent_bits | bit) != FULL_MASK:
+                visit(opponent_bits, own_bits | bit)
+
+    visit(0, 0)
+    return sorted(positions)
+
+
+POSITIONS = reachable_positions()
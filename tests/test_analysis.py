@@ -0,0 +1,50 @@
+import random
+
+from analysis import analyze_positions
+from game_logic import WIN_SCORE, GameLogic
+from positions import POSITIONS, negamax
+
+
+def board_of(own_bits, opponent_bits):
+    # X moves first, so the side to move is X when both have the same number of stones
+    own, opponent = ('X', 'O') if own_bits.bit_count() == opponent_bits.bit_count() else ('O', 'X')
+    return ''.join(own if own_bits >> cell & 1 else opponent if opponent_bits >> cell & 1 else '.'
+                   for cell in range(9))
+
+
+def expected_analysis(scores):
+    expected = {}
+    for move, score in scores.items():
+        if score > 0:
+            expected[move] = ('win', WIN_SCORE - score + 1)
+        elif score < 0:
+            expected[move] = ('loss', WIN_SCORE + score + 1)
+        else:
+            expected[move] = ('draw', len(scores))
+    return expected
+
+
+def test_analyze_scores_every_move_like_negamax():
+    game = GameLogic(3)
+    game.time_limit = None
+    for own_bits, opponent_bits in random.Random(0).sample(POSITIONS, 300):
+        analysis = game.analyze(board_of(own_bits, opponent_bits))
+        assert {entry.move: (entry.result, entry.plies) for entry in analysis} == \
+            expected_analysis(negamax(own_bits, opponent_bits))
+        assert [entry.score for entry in analysis] == sorted((entry.score for entry in analysis), reverse=True)
+
+
+def test_finished_boards_have_no_moves():
+    game = GameLogic(3)
+    assert game.analyze('XXXOO....') == []
+    assert game.analyze('XOXXOOOXX') == []
+
+
+def test_batch_results_keep_their_input_order():
+    positions = random.Random(1).sample(POSITIONS, 40)
+    requests = [(3, 3, board_of(own_bits, opponent_bits), None) for own_bits, opponent_bits in positions]
+    results = list(analyze_positions(iter(requests), workers=2, chunk_size=8))
+    assert [result['board'] for result in results] == [board for _, _, board, _ in requests]
+    for result, (own_bits, opponent_bits) in zip(results, positions):
+        assert {entry['move']: (entry['result'], entry['plies']) for entry in result['moves']} == \
+            expected_analysis(negamax(own_bits, opponent_bits))
@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from game_logic import BATCH_EMPTY, BATCH_O, BATCH_X, GameLogic, evaluate_boards
+
+
+@pytest.mark.parametrize('size, k', [(3, 3), (4, 3), (5, 4)])
+def test_evaluate_boards_matches_the_scalar_path(size, k):
+    np = pytest.importorskip('numpy')
+    rng = random.Random(size * 10 + k)
+    boards = []
+    expected = []
+    for _ in range(300):
+        game = GameLogic(size, k, rng=random.Random(0))
+        player = game.human
+        for _ in range(rng.randrange(size * size + 1)):
+            if game.check_game_end() != 'continue':
+                break
+            game.make_move(rng.choice(game.get_available_moves()), player)
+            player = game.ai if player == game.human else game.human
+        boards.append([BATCH_X if mark == game.human else BATCH_O if mark == game.ai else BATCH_EMPTY
+                       for mark in game.board])
+        result = game.check_game_end()
+        winner = {'human_win': BATCH_X, 'ai_win': BATCH_O}.get(result, BATCH_EMPTY)
+        legal = [] if result != 'continue' else game.get_available_moves()
+        expected.append((winner, result != 'continue', legal))
+
+    winners, terminal, legal = evaluate_boards(np.array(boards, dtype=np.int8), size, k)
+    for index, (winner, is_terminal, moves) in enumerate(expected):
+        assert winners[index] == winner
+        assert terminal[index] == is_terminal
+        assert np.flatnonzero(legal[index]).tolist() == moves
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from book import OpeningBook, position_key, write_book
+from game_logic import board_symmetries, canonicalize, transform_bits
+
+
+@pytest.mark.parametrize('size', [3, 4, 6, 7])
+def test_book_round_trip(tmp_path, size):
+    rng = random.Random(size)
+    entries = {}
+    positions = []
+    while len(entries) < 50:
+        cells = rng.sample(range(size * size), rng.randint(1, 7))
+        own_bits = sum(1 << cell for cell in cells[1::2])
+        opponent_bits = sum(1 << cell for cell in cells[::2])
+        key, symmetry = position_key(own_bits, opponent_bits, size)
+        if key in entries:
+            continue
+        move = rng.choice([cell for cell in range(size * size) if not (own_bits | opponent_bits) >> cell & 1])
+        entries[key] = (board_symmetries(size)[symmetry][move], len(entries) - 25, len(entries) % 2)
+        positions.append((own_bits, opponent_bits, move, entries[key]))
+
+    path = str(tmp_path / 'book.bin')
+    write_book(path, size, 3, entries)
+    with OpeningBook(path) as book:
+        assert len(book) == len(entries)
+        for own_bits, opponent_bits, move, (_, score, exact) in positions:
+            # the same position seen through any symmetry gives the same answer
+            symmetry = rng.randrange(8)
+            own_seen = transform_bits(own_bits, symmetry, size)
+            opponent_seen = transform_bits(opponent_bits, symmetry, size)
+            found_move, found_score, found_exact = book.lookup(own_seen, opponent_seen)
+            assert (found_score, found_exact) == (score, bool(exact))
+            assert (canonicalize(own_seen | 1 << found_move, opponent_seen, size)[0]
+                    == canonicalize(own_bits | 1 << move, opponent_bits, size)[0])
+        assert book.lookup(0, 0) is None
@@ -0,0 +1,26 @@
+import random
+import statistics
+import time
+
+import pytest
+
+from game_logic import GameLogic
+
+
+@pytest.mark.parametrize('size', [5, 7])
+@pytest.mark.parametrize('strength', [60, 100])
+def test_ai_move_returns_within_its_deadline(size, strength):
+    budget_ms = 40
+    overshoots = []
+    for seed in range(5):
+        game = GameLogic(size, seed=seed)
+        game.set_strength(strength)
+        game.time_limit = None
+        for cell in random.Random(seed).sample(range(size * size), 3):
+            game.make_move(cell, game.human)
+        started = time.perf_counter()
+        move = game.get_ai_move(deadline_ms=budget_ms)
+        overshoots.append((time.perf_counter() - started) * 1000 - budget_ms)
+        assert move in game.get_available_moves()
+    # the median keeps a scheduler hiccup on a busy machine from failing the test
+    assert statistics.median(overshoots) < 5
@@ -0,0 +1,51 @@
+import time
+
+from game_controller import GameController
+from game_logic import GameLogic
+from terminal import TerminalView
+
+
+class Timers:
+    # stands in for Tk's after(): callbacks run in order once run() is called
+    def __init__(self):
+        self.pending = []
+
+    def schedule(self, delay_ms, callback, *args):
+        self.pending.append((callback, args))
+        return len(self.pending)
+
+    def run(self, timeout=5):
+        give_up = time.perf_counter() + timeout
+        while self.pending and time.perf_counter() < give_up:
+            callback, args = self.pending.pop(0)
+            callback(*args)
+            time.sleep(0.001)
+
+
+class BrokenStrategy:
+    def choose_move(self, game, deadline):
+        raise RuntimeError("search blew up")
+
+
+class RecordingView(TerminalView):
+    def __init__(self, size):
+        super().__init__(size, quiet=True)
+        self.search_summaries = []
+
+    def show_search_stats(self, summary):
+        self.search_summaries.append(summary)
+
+
+def test_a_failed_search_still_answers(capsys):
+    game = GameLogic(3, seed=3)
+    game.strategy = BrokenStrategy()
+    timers = Timers()
+    view = RecordingView(3)
+    controller = GameController(game, view, schedule=timers.schedule, paced=False)
+    controller.human_move(4)
+    timers.run()
+    assert not timers.pending
+    assert [position for position, *_ in game.move_history] == [4, 0]
+    assert game.current_player == game.human
+    assert 'search blew up' in view.search_summaries[-1]
+    assert 'RuntimeError' in capsys.readouterr().err
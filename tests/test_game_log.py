@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from compact_game import Difficulty, GameResult
+from game_controller import GameController
+from game_log import (HEADER, MAGIC, RECORD, RECORD_V1, RECORD_V2, GameLogReader, GameLogWriter, GameRecord,
+                      load_stats, pack_record, stats_reset_record, unpack_record)
+from game_logic import GameLogic
+from terminal import TerminalView
+
+
+def sample_records(count=40):
+    rng = random.Random(7)
+    records = []
+    for _ in range(count):
+        size = rng.choice((3, 4, 5))
+        cells = list(range(size * size))
+        rng.shuffle(cells)
+        records.append(GameRecord(rng.uniform(1e9, 2e9), rng.randrange(1 << 32), size, rng.randint(3, size),
+                                  Difficulty(rng.randrange(3)), GameResult(rng.randint(1, 3)),
+                                  tuple(cells[:rng.randint(0, size * size)]), rng.getrandbits(64),
+                                  rng.randint(0, 100)))
+    return records
+
+
+@pytest.mark.parametrize('record_format', [RECORD, RECORD_V2, RECORD_V1])
+def test_records_round_trip(record_format):
+    for record in sample_records():
+        unpacked = unpack_record(record_format.unpack(pack_record(record, record_format)))
+        if record_format is RECORD_V1:
+            record = record._replace(seed=None, strength=None)
+        elif record_format is RECORD_V2:
+            record = record._replace(strength=None)
+        assert unpacked == record
+
+
+def test_log_file_round_trip(tmp_path):
+    path = str(tmp_path / 'games.log')
+    records = sample_records()
+    with GameLogWriter(path) as writer:
+        for record in records:
+            writer.append(record)
+    with GameLogReader(path) as reader:
+        assert list(reader) == records
+        assert reader[-1] == records[-1]
+
+
+def test_older_logs_are_appended_in_their_own_format(tmp_path):
+    path = str(tmp_path / 'games.log')
+    first, second = sample_records(2)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 2, RECORD_V2.size))
+        f.write(pack_record(first, RECORD_V2))
+    with GameLogWriter(path) as writer:
+        writer.append(second)
+    with GameLogReader(path) as reader:
+        assert [record.seed for record in reader] == [first.seed, second.seed]
+        assert [record.strength for record in reader] == [None, None]
+
+
+def test_stats_restart_after_a_reset_marker(tmp_path):
+    path = str(tmp_path / 'games.log')
+    records = sample_records(6)
+    with GameLogWriter(path) as writer:
+        for record in records[:3]:
+            writer.append(record)
+        writer.append(stats_reset_record(0.0))
+        for record in records[3:]:
+            writer.append(record)
+    stats = load_stats(path)
+    assert sum(stats.values()) == 3
+
+
+def test_undone_games_are_not_logged(tmp_path):
+    path = str(tmp_path / 'games.log')
+    game = GameLogic(3, rng=random.Random(0))
+    controller = GameController(game, TerminalView(3, quiet=True), paced=False)
+    controller.open_log(path)
+    while not game.game_over:
+        controller.human_move(game.get_available_moves()[0])
+    controller.undo()
+    while not game.game_over:
+        controller.human_move(game.get_available_moves()[-1])
+    controller.close()
+
+    assert load_stats(path) == game.stats
+    assert sum(game.stats.values()) == 1
@@ -0,0 +1,20 @@
+import random
+
+from game_logic import GameLogic
+from positions import POSITIONS, negamax
+
+
+def test_search_finds_a_best_move_everywhere():
+    game = GameLogic(3, rng=random.Random(0))
+    for own_bits, opponent_bits in POSITIONS:
+        game.reset_board()
+        for cell in range(9):
+            if own_bits >> cell & 1:
+                game.push(cell, game.ai)
+            elif opponent_bits >> cell & 1:
+                game.push(cell, game.human)
+        move, score, _ = game.search()
+        scores = negamax(own_bits, opponent_bits)
+        best = max(scores.values())
+        assert scores[move] == best
+        assert (score > 0) - (score < 0) == (best > 0) - (best < 0)
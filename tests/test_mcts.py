@@ -0,0 +1,45 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from game_logic import GameLogic
+from mcts import MCTSStrategy
+
+
+def position(ai_cells, human_cells, strategy):
+    game = GameLogic(3, rng=random.Random(0))
+    for cell in human_cells:
+        game.push(cell, game.human)
+    for cell in ai_cells:
+        game.push(cell, game.ai)
+    game.strategy = strategy
+    return game
+
+
+@pytest.mark.parametrize('ai_cells, human_cells, expected', [
+    # O completes the top row
+    ((0, 1), (4, 8, 6), 2),
+    # O has nothing to win and must stop X's diagonal
+    ((1, 3), (0, 4), 8),
+])
+def test_mcts_finds_the_forced_move(ai_cells, human_cells, expected):
+    game = position(ai_cells, human_cells, MCTSStrategy(iterations=2000, reuse_tree=False))
+    assert game.get_ai_move() == expected
+
+
+def test_the_tree_is_kept_for_the_next_move():
+    strategy = MCTSStrategy(iterations=500)
+    game = position((), (4,), strategy)
+    game.make_move(game.get_ai_move(), game.ai)
+    game.make_move(game.get_available_moves()[0], game.human)
+    root = strategy._reusable_root(game, game.bitboards[game.ai], game.bitboards[game.human])
+    assert root.visits > 0
+
+
+def test_workers_pool_their_root_visits():
+    with ThreadPoolExecutor(2) as executor:
+        strategy = MCTSStrategy(iterations=1000, workers=2, executor=executor)
+        game = position((1, 3), (0, 4), strategy)
+        assert game.get_ai_move() == 8
+    assert strategy.last_iterations == 1000
@@ -0,0 +1,77 @@
+import random
+import time
+
+from game_controller import GameController
+from game_log import game_record, reproduce
+from game_logic import DecisionStream, GameLogic
+from terminal import TerminalView
+
+
+def play_out(controller, rng):
+    game = controller.game_logic
+    while not game.game_over:
+        controller.human_move(rng.choice(game.get_available_moves()))
+
+
+def record_of(game):
+    result = {game.human: 'human_win', game.ai: 'ai_win'}.get(game.winner, 'tie')
+    return game_record(game, time.time(), 0, result)
+
+
+def test_same_seed_plays_the_same_game():
+    moves = []
+    for _ in range(2):
+        game = GameLogic(3, seed=1234)
+        game.set_strength(20)
+        controller = GameController(game, TerminalView(3, quiet=True), paced=False)
+        play_out(controller, random.Random(5))
+        moves.append([position for position, *_ in game.move_history])
+    assert moves[0] == moves[1]
+
+
+def test_games_with_an_undo_reproduce_from_their_seed():
+    rng = random.Random(3)
+    for seed in range(40):
+        game = GameLogic(3, seed=seed)
+        game.set_strength(20)
+        controller = GameController(game, TerminalView(3, quiet=True), paced=False)
+        controller.human_move(rng.choice(game.get_available_moves()))
+        if not game.game_over:
+            controller.human_move(rng.choice(game.get_available_moves()))
+        # takes back the last human move and the AI reply, whose random draws are rewound too
+        controller.undo()
+        play_out(controller, rng)
+        assert reproduce(record_of(game)) is None
+
+
+def test_redo_replays_the_same_draws():
+    game = GameLogic(3, seed=99)
+    game.set_strength(20)
+    game.make_move(4, game.human)
+    game.make_move(game.get_ai_move(), game.ai)
+    position = game.decisions.position
+    game.undo_move()
+    game.undo_move()
+    assert game.decisions.position == 0
+    game.redo_move()
+    game.redo_move()
+    assert game.decisions.position == position
+
+
+def test_a_fork_that_read_ahead_hands_its_position_back():
+    stream = DecisionStream(1, 4)
+    fork = stream.fork()
+    for _ in range(20):
+        fork.random()
+    stream.position = fork.position
+    assert stream.random() == fork.random()
+
+
+def test_an_abandoned_search_clone_draws_nothing_from_the_game():
+    game = GameLogic(3, seed=7)
+    game.set_strength(0)
+    game.make_move(0, game.human)
+    clone = game.clone()
+    clone.get_ai_move()
+    assert clone.decisions.position > 0
+    assert game.decisions.position == 0
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+def play(game_server, requests):
+    async def run():
+        return [await game_server.dispatch(request) for request in requests]
+    return asyncio.run(run())
+
+
+def test_moves_after_a_finished_game_are_rejected():
+    game_server = server.GameServer()
+    session = play(game_server, [{'op': 'new', 'difficulty': 'Easy'}])[0]['session']
+    # Easy can blunder, so play until the game ends whichever way it goes
+    result = 'continue'
+    while result == 'continue':
+        board = game_server.sessions[session].moves
+        free = next(cell for cell in range(9) if cell not in board)
+        result = play(game_server, [{'op': 'move', 'session': session, 'position': free}])[0]['result']
+    moves = bytes(game_server.sessions[session].moves)
+
+    for cell in range(9):
+        if cell not in moves:
+            with pytest.raises(ValueError):
+                play(game_server, [{'op': 'move', 'session': session, 'position': cell}])
+    assert bytes(game_server.sessions[session].moves) == moves
+
+    stats = play(game_server, [{'op': 'stats', 'session': session}])[0]['stats']
+    assert sum(stats.values()) == 1
+
+
+def test_reset_allows_a_new_game():
+    game_server = server.GameServer()
+    session = play(game_server, [{'op': 'new'}])[0]['session']
+    play(game_server, [{'op': 'move', 'session': session, 'position': 4}])
+    play(game_server, [{'op': 'reset', 'session': session}])
+    response = play(game_server, [{'op': 'move', 'session': session, 'position': 0}])[0]
+    assert response['result'] == 'continue'
+    assert response['board'].count('X') == 1
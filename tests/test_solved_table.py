@@ -0,0 +1,15 @@
+from game_logic import solved_position
+from positions import POSITIONS, negamax
+
+
+def test_every_non_terminal_position_is_reached():
+    assert len(POSITIONS) == 4520
+
+
+def test_solved_table_matches_negamax():
+    for own_bits, opponent_bits in POSITIONS:
+        scores = negamax(own_bits, opponent_bits)
+        best = max(scores.values())
+        score, moves = solved_position(own_bits, opponent_bits)
+        assert score == best
+        assert set(moves) == {cell for cell, value in scores.items() if value == best}
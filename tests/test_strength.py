@@ -0,0 +1,48 @@
+import random
+
+from compact_game import Difficulty, GameResult
+from game_log import GameRecord, replay
+from game_logic import GameLogic
+
+
+def first_replies(strength, seeds):
+    moves = []
+    for seed in seeds:
+        game = GameLogic(3, seed=seed)
+        game.set_strength(strength)
+        game.make_move(0, game.human)
+        moves.append(game.get_ai_move())
+    return moves
+
+
+def test_every_strength_step_changes_3x3_play():
+    # only the centre holds the draw after a corner opening, so every other reply is a slip
+    seeds = range(1000)
+    slips = []
+    previous = None
+    for strength in range(75, 100):
+        moves = first_replies(strength, seeds)
+        assert moves != previous
+        previous = moves
+        slips.append(sum(move != 4 for move in moves))
+    assert slips == sorted(slips, reverse=True)
+    assert first_replies(100, seeds) == [4] * len(seeds)
+
+
+def test_a_clone_searches_into_the_games_level_cache():
+    game = GameLogic(4, seed=1)
+    game.set_strength(60)
+    game.make_move(5, game.human)
+    clone = game.clone()
+    clone.get_ai_move()
+    assert len(clone._strength_cache[1]) > 0
+    assert game._strength_cache is clone._strength_cache
+
+
+def test_replay_restores_the_recorded_strength():
+    game = GameLogic(3, rng=random.Random(0))
+    game.set_strength(35)
+    game.make_move(4, game.human)
+    record = GameRecord(0.0, 0, 3, 3, Difficulty.EASY, GameResult.CONTINUE, (4,), game.game_seed, 35)
+    assert replay(record).strength == 35
+    assert replay(record._replace(strength=None, difficulty=Difficulty.MEDIUM)).strength == 50
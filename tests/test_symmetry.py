@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from game_logic import GameLogic, board_symmetries, canonicalize, restore_cell, transform_bits, transform_cell
+
+
+def random_position(rng, size):
+    cells = rng.sample(range(size * size), rng.randint(0, size * size))
+    split = len(cells) // 2
+    return sum(1 << cell for cell in cells[:split]), sum(1 << cell for cell in cells[split:])
+
+
+@pytest.mark.parametrize('size', [3, 4, 5, 7])
+def test_transform_bits_moves_every_cell(size):
+    rng = random.Random(size)
+    for _ in range(100):
+        bits = random_position(rng, size)[0]
+        for symmetry, image in enumerate(board_symmetries(size)):
+            expected = sum(1 << image[cell] for cell in range(size * size) if bits >> cell & 1)
+            assert transform_bits(bits, symmetry, size) == expected
+            for cell in range(size * size):
+                assert restore_cell(transform_cell(cell, symmetry, size), symmetry, size) == cell
+
+
+@pytest.mark.parametrize('size', [3, 4, 5, 7])
+def test_every_image_of_a_position_has_one_key(size):
+    rng = random.Random(size)
+    for _ in range(100):
+        own_bits, opponent_bits = random_position(rng, size)
+        key, symmetry = canonicalize(own_bits, opponent_bits, size)
+        assert key == (transform_bits(own_bits, symmetry, size), transform_bits(opponent_bits, symmetry, size))
+        for image in range(8):
+            seen = canonicalize(transform_bits(own_bits, image, size), transform_bits(opponent_bits, image, size),
+                                size)
+            assert seen[0] == key
+
+
+def test_a_mirrored_position_is_answered_from_the_cache():
+    game = GameLogic(4, rng=random.Random(0))
+    game.max_depth = 3
+    game.push(1, game.human)
+    game.push(6, game.ai)
+    game.push(0, game.human)
+    move = game.search()[0]
+    entries = len(game.position_cache)
+
+    mirror = GameLogic(4, rng=random.Random(0))
+    mirror.max_depth = 3
+    mirror.position_cache = game.position_cache
+    # the same stones reflected left to right
+    for cell, player in ((2, mirror.human), (5, mirror.ai), (3, mirror.human)):
+        mirror.push(cell, player)
+    assert mirror.search()[0] == transform_cell(move, 4, 4)
+    assert len(game.position_cache) == entries
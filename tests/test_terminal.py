@@ -0,0 +1,34 @@
+import io
+import random
+
+from game_controller import GameController
+from game_logic import GameLogic
+from terminal import HELP, TerminalView, run
+
+
+def play(commands, quiet=False):
+    out = io.StringIO()
+    game = GameLogic(3, rng=random.Random(0))
+    view = TerminalView(3, out=out, quiet=quiet)
+    controller = GameController(game, view, paced=False)
+    run(controller, view, io.StringIO(''.join(f"{command}\n" for command in commands)))
+    return game, out.getvalue()
+
+
+def test_commands_drive_the_game():
+    game, output = play(['5', 'u', 'r', '0', '5', 'dance', 'q', '1'])
+    # 5 is played, undone and redone; the second 5 is taken and q stops before the 1
+    assert len(game.move_history) == 2
+    assert game.move_history[0][0] == 4
+    assert output.count("illegal move:") == 2
+    assert HELP in output
+    # the first board is the empty one, numbered from 1
+    assert output.splitlines()[0].split('|')[0].strip() == '1'
+
+
+def test_quiet_mode_prints_only_the_result():
+    # trying every cell in turn finishes the game whatever the AI replies
+    game, output = play([str(cell) for cell in range(1, 10)], quiet=True)
+    assert game.game_over
+    assert any(result in output for result in ("VICTORY!", "AI WINS!", "IT'S A TIE!"))
+    assert '|' not in output
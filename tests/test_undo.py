@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from game_logic import GameLogic
+
+
+def game_state(game):
+    return (dict(game.bitboards), game.zobrist_hash, game.winner, game.winning_line,
+            {player: list(counts) for player, counts in game.line_counts.items()})
+
+
+@pytest.mark.parametrize('size, k', [(3, 3), (4, 3), (5, 4)])
+def test_undo_and_redo_round_trip(size, k):
+    rng = random.Random(size * 10 + k)
+    for _ in range(50):
+        game = GameLogic(size, k, rng=random.Random(0))
+        states = [game_state(game)]
+        player = game.human
+        while game.check_game_end() == 'continue':
+            assert game.make_move(rng.choice(game.get_available_moves()), player)
+            states.append(game_state(game))
+            player = game.ai if player == game.human else game.human
+        stats = dict(game.stats)
+
+        moves = len(states) - 1
+        for index in range(moves - 1, -1, -1):
+            assert game.undo_move() is not None
+            assert game_state(game) == states[index]
+        assert game.undo_move() is None
+        # the finished game was taken back, so it no longer counts
+        assert sum(game.stats.values()) == sum(stats.values()) - 1
+
+        for index in range(1, moves + 1):
+            assert game.redo_move() is not None
+            assert game_state(game) == states[index]
+        assert game.redo_move() is None
+        assert game.check_game_end() != 'continue'
+        assert game.stats == stats
@@ -1,5 +1,6 @@
 import tkinter as tk
-from tkinter import ttk
+
+from board_view import create_board_view
 
 
 class UIComponents:
@@ -85,31 +86,28 @@ class UIComponents:
             fg=self.colors['text_secondary']
         ).pack()
 
-        style = ttk.Style()
-        style.theme_use('clam')
-        style.configure('Custom.TCombobox',
-                        fieldbackground=self.colors['bg_tertiary'],
-                        background=self.colors['bg_tertiary'],
-                        foreground=self.colors['text_primary'],
-                        arrowcolor=self.colors['accent_blue'],
-                        borderwidth=0,
-                        relief='flat')
-
-        difficulty_combo = ttk.Combobox(
+        # 0-100 strength; the callback gets the new value as a string while the slider moves
+        difficulty_scale = tk.Scale(
             difficulty_section,
-            textvariable=difficulty_var,
-            values=['Easy', 'Medium', 'Hard'],
-            state='readonly',
-            style='Custom.TCombobox',
-            font=('Segoe UI', 12, 'bold'),
-            width=8
+            variable=difficulty_var,
+            from_=0,
+            to=100,
+            orient='horizontal',
+            length=160,
+            font=('Segoe UI', 10, 'bold'),
+            bg=self.colors['bg_secondary'],
+            fg=self.colors['text_primary'],
+            troughcolor=self.colors['bg_tertiary'],
+            activebackground=self.colors['accent_blue'],
+            highlightthickness=0,
+            bd=0,
+            command=difficulty_callback
         )
-        difficulty_combo.pack(pady=(8, 0))
-        difficulty_combo.bind('<<ComboboxSelected>>', difficulty_callback)
+        difficulty_scale.pack(pady=(8, 0))
 
         return header_card, stats_label
 
-    def create_game_board(self, parent, button_callback):
+    def create_game_board(self, parent, button_callback, size=3):
         board_container = tk.Frame(parent, bg=self.colors['bg_primary'])
         board_container.pack(pady=20)
 
@@ -126,36 +124,9 @@ class UIComponents:
         )
         board_frame.pack()
 
-        buttons = []
-        for i in range(3):
-            for j in range(3):
-                btn = tk.Button(
-                    board_frame,
-                    text=' ',
-                    font=('Segoe UI', 28, 'bold'),
-                    width=3,
-                    height=1,
-                    bg=self.colors['bg_tertiary'],
-                    fg=self.colors['text_primary'],
-                    activebackground=self.colors['hover_bg'],
-                    activeforeground=self.colors['text_primary'],
-                    relief='flat',
-                    bd=0,
-                    command=lambda row=i, col=j: button_callback(row * 3 + col),
-                    cursor='hand2'
-                )
-                btn.grid(row=i, column=j, padx=3, pady=3, sticky='nsew')
-
-                btn.bind('<Enter>', lambda e, b=btn: self.on_button_hover(b, True))
-                btn.bind('<Leave>', lambda e, b=btn: self.on_button_hover(b, False))
-
-                buttons.append(btn)
-
-        for i in range(3):
-            board_frame.grid_rowconfigure(i, weight=1, minsize=80)
-            board_frame.grid_columnconfigure(i, weight=1, minsize=80)
-
-        return board_container, buttons
+        board_view = create_board_view(board_frame, self.colors, size, button_callback)
+
+        return board_container, board_view
 
     def create_status_section(self, parent):
         status_frame = tk.Frame(parent, bg=self.colors['bg_primary'])
@@ -184,6 +155,41 @@ class UIComponents:
 
         return status_frame, status_label, thinking_dots
 
+    def create_search_stats_label(self, status_frame):
+        search_stats_label = tk.Label(
+            status_frame,
+            text="",
+            font=('Segoe UI', 10),
+            bg=self.colors['bg_primary'],
+            fg=self.colors['text_tertiary']
+        )
+        search_stats_label.pack(pady=(6, 0))
+
+        return search_stats_label
+
+    def create_history_buttons(self, parent, undo_callback, redo_callback):
+        history_frame = tk.Frame(parent, bg=self.colors['bg_primary'])
+        history_frame.pack()
+
+        for text, callback in (("UNDO", undo_callback), ("REDO", redo_callback)):
+            tk.Button(
+                history_frame,
+                text=text,
+                font=('Segoe UI', 10, 'bold'),
+                bg=self.colors['bg_tertiary'],
+                fg=self.colors['text_primary'],
+                activebackground=self.colors['hover_bg'],
+                activeforeground=self.colors['text_primary'],
+                relief='flat',
+                bd=0,
+                padx=18,
+                pady=6,
+                command=callback,
+                cursor='hand2'
+            ).pack(side='left', padx=6)
+
+        return history_frame
+
     def create_control_buttons(self, parent, new_game_callback, reset_stats_callback, quit_callback):
         button_frame = tk.Frame(parent, bg=self.colors['bg_primary'])
         button_frame.pack(pady=30)
@@ -241,48 +247,6 @@ class UIComponents:
 
         return button_frame
 
-    def on_button_hover(self, button, entering):
-        if button['state'] != 'disabled':
-            if entering:
-                button.config(bg=self.colors['hover_bg'])
-            else:
-                button.config(bg=self.colors['bg_tertiary'])
-
-    def update_button(self, button, text, player_type):
-        if player_type == 'human':
-            button.config(
-                text=text,
-                state='disabled',
-                bg=self.colors['accent_red'],
-                disabledforeground='white',
-                font=('Segoe UI', 32, 'bold')
-            )
-        elif player_type == 'ai':
-            button.config(
-                text=text,
-                state='disabled',
-                bg=self.colors['accent_blue'],
-                disabledforeground='white',
-                font=('Segoe UI', 32, 'bold')
-            )
-
-    def highlight_winning_buttons(self, buttons, winning_positions):
-        for pos in winning_positions:
-            buttons[pos].config(
-                bg=self.colors['win_highlight'],
-                disabledforeground='#000000'
-            )
-
-    def reset_buttons(self, buttons):
-        for btn in buttons:
-            btn.config(
-                text=' ',
-                state='normal',
-                bg=self.colors['bg_tertiary'],
-                disabledforeground=self.colors['text_primary'],
-                font=('Segoe UI', 28, 'bold')
-            )
-
     def update_status(self, status_label, message, status_type):
         color_map = {
             'player_turn': self.colors['accent_green'],